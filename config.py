@@ -113,8 +113,25 @@ class ConfigMixin:
 
         return True
 
+    def _provider_is_configured_cached(self, action=None):
+        """
+        Memoized _provider_is_configured for dialog response loops.
+
+        Dialog loops re-check the provider on every button press, sometimes
+        several times per iteration. The answer only changes when the config
+        is saved, so cache per action and let _save_config invalidate.
+        """
+        cache = getattr(self, "_provider_config_cache", None)
+        if cache is None:
+            cache = self._provider_config_cache = {}
+        if action not in cache:
+            cache[action] = self._provider_is_configured(action=action)
+        return cache[action]
+
     def _save_config(self):
         """Save configuration to GIMP preferences directory"""
+        # Any save can change what counts as "configured"
+        getattr(self, "_provider_config_cache", {}).clear()
         try:
             gimp_user_dir = Gimp.directory()
             config_dir = os.path.join(gimp_user_dir, self.PLUGIN_DIRNAME)
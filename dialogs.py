@@ -44,12 +44,17 @@ class DialogsMixin:
         content_area.set_margin_bottom(margin)
         return content_area
 
-    def _add_api_warning_bar(self, content_area, dialog, action=None):
+    def _add_api_warning_bar(self, content_area, dialog, action=None, always_build=False):
         """
         Add provider configuration warning info bar if needed.
+
+        With always_build=True the bar is constructed even when the provider
+        is currently configured - hidden and excluded from show_all - so
+        cached dialogs can toggle it on later runs in either direction.
         Returns (warning_bar, ok_button_needs_config).
         """
-        if self._provider_is_configured(action=action):
+        needs_config = not self._provider_is_configured(action=action)
+        if not needs_config and not always_build:
             return None, False
 
         # Create warning info bar
@@ -80,7 +85,16 @@ class DialogsMixin:
 
         content_area.pack_start(api_warning_bar, False, False, 5)
 
-        return api_warning_bar, True
+        if always_build:
+            # Flag the children visible now, then let the bar manage its own
+            # visibility: show_all on the content area must not resurrect a
+            # bar that a per-run reset has hidden
+            api_warning_bar.show_all()
+            api_warning_bar.set_no_show_all(True)
+            if not needs_config:
+                api_warning_bar.hide()
+
+        return api_warning_bar, needs_config
 
     def _create_progress_widget(self):
         """Create progress label widget for dialogs"""
@@ -5,7 +5,7 @@ Image processing mixin for GIMP AI Plugin.
 import os
 import tempfile
 import gi
-from gi.repository import Gimp, Gio, GdkPixbuf
+from gi.repository import Gimp, Gio, GLib, GdkPixbuf
 
 
 class ImageProcessingMixin:
@@ -396,12 +396,28 @@ class ImageProcessingMixin:
         Returns:
             Gimp.Image or None
         """
+        # Fast path: decode in memory via GdkPixbuf and wrap the pixbuf in a
+        # new image, skipping the temp-file write/read/unlink round-trip.
+        try:
+            stream = Gio.MemoryInputStream.new_from_bytes(GLib.Bytes.new(image_data))
+            pixbuf = GdkPixbuf.Pixbuf.new_from_stream(stream, None)
+            image = Gimp.Image.new(
+                pixbuf.get_width(), pixbuf.get_height(), Gimp.ImageBaseType.RGB
+            )
+            layer = Gimp.Layer.new_from_pixbuf(
+                image, "Background", pixbuf, 100.0, Gimp.LayerMode.NORMAL, 0.0, 1.0
+            )
+            image.insert_layer(layer, None, 0)
+            return image
+        except Exception as e:
+            print(f"DEBUG: In-memory image load failed, falling back to temp file: {e}")
+
         try:
             # Write to temp file
             with tempfile.NamedTemporaryFile(suffix=".png", delete=False) as temp_file:
                 temp_filename = temp_file.name
                 temp_file.write(image_data)
-            
+
             try:
                 # Load image
                 file = Gio.File.new_for_path(temp_filename)
@@ -413,7 +429,7 @@ class ImageProcessingMixin:
                 # Clean up temp file
                 if os.path.exists(temp_filename):
                     os.unlink(temp_filename)
-                    
+
         except Exception as e:
             print(f"ERROR: Failed to create image from data: {e}")
             return None
@@ -4,10 +4,241 @@ Inpainting mixin for GIMP AI Plugin.
 
 import os
 import tempfile
-import base64
+from collections import namedtuple
+from concurrent.futures import Future, ThreadPoolExecutor
+
 import gi
 from gi.repository import Gimp, Gio, Gegl, GLib
 
+# Optional NumPy for bulk pixel math. Boundary color sampling degrades
+# gracefully (color matching is skipped) when it is unavailable.
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+# Debug logging gate. Each DEBUG print is a blocking stdout write, which adds
+# up over the hundreds emitted per inpaint when GIMP runs from a terminal.
+# Set GIMP_COMFY_AI_DEBUG=1 in the environment to turn them back on.
+_DEBUG = os.environ.get("GIMP_COMFY_AI_DEBUG", "0") not in ("", "0")
+
+
+def _debug(msg):
+    """Print a debug message when debug logging is enabled."""
+    if _DEBUG:
+        print(msg)
+
+
+# Shared black Gegl.Color sentinel; Gegl.Color.new parses the color-name
+# string through babl on every construction, and the color is immutable
+# for our purposes, so build it once and reuse it everywhere.
+_GEGL_BLACK = None
+
+
+def _gegl_black():
+    global _GEGL_BLACK
+    if _GEGL_BLACK is None:
+        _GEGL_BLACK = Gegl.Color.new("black")
+    return _GEGL_BLACK
+
+
+# Pool for filesystem work that can overlap GIMP work on the main thread.
+# The GIMP PDB is not thread-safe, so no GIMP API calls may run here.
+_EXPORT_POOL = ThreadPoolExecutor(max_workers=2)
+
+# The PDB PNG exporter needs a real file path, but the round-trip is pure
+# scratch data. On Linux /dev/shm is a RAM-backed tmpfs, which keeps the
+# export/read cycle off the disk entirely; elsewhere fall back to the
+# platform default temp dir (None).
+_RAM_TMPDIR = "/dev/shm" if os.path.isdir("/dev/shm") else None
+
+
+def _read_png_unlink(path):
+    """Read an exported PNG, delete it, and return its raw bytes.
+
+    Runs on _EXPORT_POOL so the disk read of the context image can overlap
+    the mask creation that follows on the main thread.
+    """
+    with open(path, "rb") as f:
+        png_data = f.read()
+    os.unlink(path)
+    return png_data
+
+
+# Snapshot of per-image state the inpaint pipeline needs over and over.
+# Fetched once per inpaint (see _gather_image_state) instead of re-issuing
+# get_width/get_height/Selection.bounds GObject dispatches in every method.
+_ImageState = namedtuple(
+    "_ImageState",
+    ["width", "height", "has_selection", "sel_x1", "sel_y1", "sel_x2", "sel_y2"],
+)
+
+
+class _MaskGraphTemplates:
+    """Lazily-built, reusable GEGL graph templates for mask construction.
+
+    The node topology used by _create_full_size_mask_then_scale never changes
+    between calls - only the buffers and the translate offset do - so each
+    graph is built once per process and re-pointed on every call instead of
+    reconstructing the nodes through GObject introspection each time.
+    """
+
+    def __init__(self):
+        self._composite = None
+        self._transparency = None
+        self._feather = None
+        self._feather_pyramid = None
+        self._levels = None
+        # Every buffer-source/write-buffer node across the cached graphs,
+        # so release() can drop their buffer references in one sweep.
+        self._buffer_nodes = []
+
+    def composite(self, mask_buffer, selection_buffer, offset_x, offset_y, out_buffer):
+        """Re-point the selection-composite graph and return its output node."""
+        if self._composite is None:
+            graph = Gegl.Node()
+
+            mask_source = graph.create_child("gegl:buffer-source")
+            selection_source = graph.create_child("gegl:buffer-source")
+            translate = graph.create_child("gegl:translate")
+            composite = graph.create_child("gegl:over")
+            output = graph.create_child("gegl:write-buffer")
+
+            selection_source.link(translate)
+            mask_source.link(composite)
+            translate.connect_to("output", composite, "aux")
+            composite.link(output)
+
+            self._buffer_nodes += [mask_source, selection_source, output]
+            self._composite = (graph, mask_source, selection_source, translate, output)
+
+        _graph, mask_source, selection_source, translate, output = self._composite
+        mask_source.set_property("buffer", mask_buffer)
+        selection_source.set_property("buffer", selection_buffer)
+        translate.set_property("x", float(offset_x))
+        translate.set_property("y", float(offset_y))
+        output.set_property("buffer", out_buffer)
+        return output
+
+    def transparency(self, layer_buffer, out_buffer):
+        """Re-point the black-to-alpha graph and return its output node."""
+        if self._transparency is None:
+            graph = Gegl.Node()
+
+            buffer_source = graph.create_child("gegl:buffer-source")
+            color_to_alpha = graph.create_child("gegl:color-to-alpha")
+            # Make background transparent; selection stays opaque (ComfyUI behavior).
+            color_to_alpha.set_property("color", _gegl_black())
+            buffer_write = graph.create_child("gegl:write-buffer")
+
+            buffer_source.link(color_to_alpha)
+            color_to_alpha.link(buffer_write)
+
+            self._buffer_nodes += [buffer_source, buffer_write]
+            self._transparency = (graph, buffer_source, buffer_write)
+
+        _graph, buffer_source, buffer_write = self._transparency
+        buffer_source.set_property("buffer", layer_buffer)
+        buffer_write.set_property("buffer", out_buffer)
+        return buffer_write
+
+    def feather(self, mask_buffer, out_buffer, std_dev):
+        """Re-point the gaussian-blur feathering graph and return its output node."""
+        if self._feather is None:
+            graph = Gegl.Node()
+
+            source = graph.create_child("gegl:buffer-source")
+            blur = graph.create_child("gegl:gaussian-blur")
+            output = graph.create_child("gegl:write-buffer")
+
+            source.link(blur)
+            blur.link(output)
+
+            self._buffer_nodes += [source, output]
+            self._feather = (graph, source, blur, output)
+
+        _graph, source, blur, output = self._feather
+        source.set_property("buffer", mask_buffer)
+        blur.set_property("std-dev-x", float(std_dev))
+        blur.set_property("std-dev-y", float(std_dev))
+        output.set_property("buffer", out_buffer)
+        return output
+
+    def feather_pyramid(self, mask_buffer, out_buffer, std_dev):
+        """Re-point the half-resolution feathering graph and return its output node.
+
+        Gaussian blur cost scales with pixel count times kernel width, so
+        blurring at half resolution with half the radius and scaling back up
+        does roughly a quarter of the work. The resample softness it adds is
+        indistinguishable on a mask that is being blurred anyway.
+        """
+        if self._feather_pyramid is None:
+            graph = Gegl.Node()
+
+            source = graph.create_child("gegl:buffer-source")
+            downscale = graph.create_child("gegl:scale-ratio")
+            downscale.set_property("x", 0.5)
+            downscale.set_property("y", 0.5)
+            blur = graph.create_child("gegl:gaussian-blur")
+            upscale = graph.create_child("gegl:scale-ratio")
+            upscale.set_property("x", 2.0)
+            upscale.set_property("y", 2.0)
+            output = graph.create_child("gegl:write-buffer")
+
+            source.link(downscale)
+            downscale.link(blur)
+            blur.link(upscale)
+            upscale.link(output)
+
+            self._buffer_nodes += [source, output]
+            self._feather_pyramid = (graph, source, blur, output)
+
+        _graph, source, blur, output = self._feather_pyramid
+        source.set_property("buffer", mask_buffer)
+        blur.set_property("std-dev-x", float(std_dev) / 2.0)
+        blur.set_property("std-dev-y", float(std_dev) / 2.0)
+        output.set_property("buffer", out_buffer)
+        return output
+
+    def levels_gamma(self, layer_buffer, out_buffer, gamma):
+        """Re-point the gamma-adjustment graph and return its output node."""
+        if self._levels is None:
+            graph = Gegl.Node()
+
+            source = graph.create_child("gegl:buffer-source")
+            levels = graph.create_child("gegl:levels")
+            levels.set_property("in-low", 0.0)
+            levels.set_property("in-high", 1.0)
+            levels.set_property("out-low", 0.0)
+            levels.set_property("out-high", 1.0)
+            output = graph.create_child("gegl:write-buffer")
+
+            source.link(levels)
+            levels.link(output)
+
+            self._buffer_nodes += [source, output]
+            self._levels = (graph, source, levels, output)
+
+        _graph, source, levels, output = self._levels
+        source.set_property("buffer", layer_buffer)
+        levels.set_property("gamma", float(gamma))
+        output.set_property("buffer", out_buffer)
+        return output
+
+    def release(self):
+        """Drop buffer references held by the cached graphs.
+
+        The graphs live for the whole process; without this, the buffer-source
+        and write-buffer nodes keep the last mask's tiles alive across the
+        multi-second ComfyUI wait even after the scratch image is deleted.
+        """
+        for node in self._buffer_nodes:
+            node.set_property("buffer", None)
+
+
+_MASK_GRAPHS = _MaskGraphTemplates()
+
 # Import coordinate utilities
 from utils import (
     extract_context_with_selection,
@@ -20,44 +251,79 @@ from utils import (
 
 class InpaintMixin:
     """Mixin class providing inpainting functionality"""
-    
-    def _calculate_context_extraction(self, image):
+
+    # Cached PDB handle for "file-png-export". Procedure lookup and config
+    # construction go through PDB introspection on every call otherwise; only
+    # the image and file differ between exports, so both objects are built
+    # once and re-pointed per export.
+    _pdb_png_export = None
+
+    @classmethod
+    def _png_export_config(cls):
+        if cls._pdb_png_export is None:
+            pdb_proc = Gimp.get_pdb().lookup_procedure("file-png-export")
+            pdb_config = pdb_proc.create_config()
+            pdb_config.set_property("run-mode", Gimp.RunMode.NONINTERACTIVE)
+            pdb_config.set_property("options", None)
+            cls._pdb_png_export = (pdb_proc, pdb_config)
+        return cls._pdb_png_export
+
+    def _gather_image_state(self, image):
+        """Fetch image dimensions and selection bounds once per inpaint.
+
+        Each get_width/get_height/Selection.bounds call is a separate GObject
+        dispatch into GIMP; the inpaint pipeline needs these values in half a
+        dozen methods, so batch them into one immutable snapshot that travels
+        through context_info["image_state"].
+        """
+        width = image.get_width()
+        height = image.get_height()
+        selection_bounds = Gimp.Selection.bounds(image)
+        has_selection = len(selection_bounds) >= 5 and selection_bounds[0]
+
+        sel_x1 = selection_bounds[2] if len(selection_bounds) > 2 else 0
+        sel_y1 = selection_bounds[3] if len(selection_bounds) > 3 else 0
+        sel_x2 = selection_bounds[4] if len(selection_bounds) > 4 else 0
+        sel_y2 = selection_bounds[5] if len(selection_bounds) > 5 else 0
+
+        return _ImageState(
+            width, height, has_selection, sel_x1, sel_y1, sel_x2, sel_y2
+        )
+
+    def _calculate_context_extraction(self, image, image_state=None):
         """Calculate smart context extraction area around selection using optimal shapes"""
+        # Resolve dimensions and selection before the try block: the exception
+        # fallback used to re-reference img_width/img_height, which raised a
+        # secondary NameError (masking the original error) whenever the
+        # exception fired before they were assigned.
+        if image_state is None:
+            image_state = self._gather_image_state(image)
+        img_width = image_state.width
+        img_height = image_state.height
+
         try:
-            print("DEBUG: Calculating smart context extraction with optimal shapes")
-
-            # Get image dimensions
-            img_width = image.get_width()
-            img_height = image.get_height()
-            print(f"DEBUG: Original image size: {img_width}x{img_height}")
-
-            # Check for selection
-            selection_bounds = Gimp.Selection.bounds(image)
-            print(f"DEBUG: Selection bounds raw: {selection_bounds}")
-
-            if len(selection_bounds) < 5 or not selection_bounds[0]:
-                print("DEBUG: No selection found, using center area")
-                # Use new shape-aware function with no selection
-                return extract_context_with_selection(
-                    img_width,
-                    img_height,
-                    0,
-                    0,
-                    0,
-                    0,
-                    mode="focused",
-                    has_selection=False,
+            _debug("DEBUG: Calculating smart context extraction with optimal shapes")
+            _debug(f"DEBUG: Original image size: {img_width}x{img_height}")
+            _debug(f"DEBUG: Image state: {image_state}")
+
+            if not image_state.has_selection:
+                _debug("DEBUG: No selection found, using full-image extraction")
+                # Without a selection the focused pipeline degenerates to the
+                # same scale/pad result as the full-image path, so dispatch
+                # there directly instead of running the synthetic center-area
+                # extraction on top of it.
+                return self._calculate_full_image_context_extraction(
+                    image, image_state
                 )
 
-            # Extract selection bounds
-            sel_x1 = selection_bounds[2] if len(selection_bounds) > 2 else 0
-            sel_y1 = selection_bounds[3] if len(selection_bounds) > 3 else 0
-            sel_x2 = selection_bounds[4] if len(selection_bounds) > 4 else 0
-            sel_y2 = selection_bounds[5] if len(selection_bounds) > 5 else 0
+            sel_x1 = image_state.sel_x1
+            sel_y1 = image_state.sel_y1
+            sel_x2 = image_state.sel_x2
+            sel_y2 = image_state.sel_y2
 
             sel_width = sel_x2 - sel_x1
             sel_height = sel_y2 - sel_y1
-            print(
+            _debug(
                 f"DEBUG: Selection: ({sel_x1},{sel_y1}) to ({sel_x2},{sel_y2}), size: {sel_width}x{sel_height}"
             )
 
@@ -72,9 +338,10 @@ class InpaintMixin:
                 mode="focused",
                 has_selection=True,
             )
+            context_info["image_state"] = image_state
 
             # Log the optimal shape selected
-            print(f"DEBUG: Optimal shape selected: {context_info['target_shape']}")
+            _debug(f"DEBUG: Optimal shape selected: {context_info['target_shape']}")
 
             # Extract dimensions for any code that still expects target_size
             target_w, target_h = context_info["target_shape"]
@@ -83,17 +350,10 @@ class InpaintMixin:
             # Validate still works but now with shape support
             is_valid, error_msg = validate_context_info(context_info)
             if not is_valid:
-                print(f"DEBUG: Context validation failed: {error_msg}")
-                # Fallback to center extraction
-                return extract_context_with_selection(
-                    img_width,
-                    img_height,
-                    0,
-                    0,
-                    0,
-                    0,
-                    mode="focused",
-                    has_selection=False,
+                _debug(f"DEBUG: Context validation failed: {error_msg}")
+                # Fallback to full-image extraction
+                return self._calculate_full_image_context_extraction(
+                    image, image_state
                 )
 
             # Add debug output for the calculated values
@@ -102,40 +362,41 @@ class InpaintMixin:
             ]
             target_w, target_h = context_info["target_shape"]
 
-            print(
+            _debug(
                 f"DEBUG: Extract region: ({extract_x1},{extract_y1}) to ({extract_x1+extract_width},{extract_y1+extract_height}), size: {extract_width}x{extract_height}"
             )
-            print(f"DEBUG: Target shape for OpenAI: {target_w}x{target_h}")
+            _debug(f"DEBUG: Target shape for OpenAI: {target_w}x{target_h}")
 
             if "padding_info" in context_info:
                 padding_info = context_info["padding_info"]
-                print(f"DEBUG: Scale factor: {padding_info['scale_factor']}")
-                print(f"DEBUG: Padding: {padding_info['padding']}")
+                _debug(f"DEBUG: Scale factor: {padding_info['scale_factor']}")
+                _debug(f"DEBUG: Padding: {padding_info['padding']}")
 
             return context_info
 
         except Exception as e:
-            print(f"DEBUG: Context calculation failed: {e}")
-            # Fallback to simple center extraction
-            return extract_context_with_selection(
-                img_width, img_height, 0, 0, 0, 0, mode="focused", has_selection=False
-            )
+            _debug(f"DEBUG: Context calculation failed: {e}")
+            # Fallback to full-image extraction
+            return self._calculate_full_image_context_extraction(image, image_state)
 
-    def _calculate_full_image_context_extraction(self, image):
+    def _calculate_full_image_context_extraction(self, image, image_state=None):
         """Calculate context extraction for full image (GPT-Image-1 mode)"""
         try:
-            print("DEBUG: Calculating full image context extraction")
+            _debug("DEBUG: Calculating full image context extraction")
+
+            if image_state is None:
+                image_state = self._gather_image_state(image)
 
             # Get full image dimensions
-            orig_width = image.get_width()
-            orig_height = image.get_height()
-            print(f"DEBUG: Original full image size: {orig_width}x{orig_height}")
+            orig_width = image_state.width
+            orig_height = image_state.height
+            _debug(f"DEBUG: Original full image size: {orig_width}x{orig_height}")
 
             # Use full image bounds as "selection"
             full_x1, full_y1 = 0, 0
             full_x2, full_y2 = orig_width, orig_height
 
-            print(
+            _debug(
                 f"DEBUG: Full image bounds: ({full_x1},{full_y1}) to ({full_x2},{full_y2})"
             )
 
@@ -144,35 +405,33 @@ class InpaintMixin:
             target_width, target_height = target_shape
             target_size = max(target_width, target_height)  # For backward compatibility
 
-            print(f"DEBUG: Target OpenAI shape: {target_width}x{target_height}")
+            _debug(f"DEBUG: Target OpenAI shape: {target_width}x{target_height}")
 
             # For full image, the context covers the entire original image
             ctx_x1 = 0
             ctx_y1 = 0
 
-            print(
+            _debug(
                 f"DEBUG: Context region covers entire image: {orig_width}x{orig_height}"
             )
 
             # Check if there's actually a selection - if not, use full image for transformation
-            selection_bounds = Gimp.Selection.bounds(image)
-            has_real_selection = (
-                selection_bounds[0] if len(selection_bounds) > 0 else False
-            )
+            has_real_selection = image_state.has_selection
 
             if has_real_selection:
                 # Use actual selection bounds
                 sel_bounds = (
-                    selection_bounds[2],
-                    selection_bounds[3],
-                    selection_bounds[4],
-                    selection_bounds[5],
+                    image_state.sel_x1,
+                    image_state.sel_y1,
+                    image_state.sel_x2,
+                    image_state.sel_y2,
                 )
             else:
                 # No selection - transform entire image ("Image to Image" mode)
                 sel_bounds = (full_x1, full_y1, full_x2, full_y2)
 
             return {
+                "image_state": image_state,
                 "mode": "full",
                 "selection_bounds": sel_bounds,
                 "extract_region": (
@@ -192,26 +451,34 @@ class InpaintMixin:
             }
 
         except Exception as e:
-            print(f"DEBUG: Failed to calculate full image context extraction: {e}")
+            _debug(f"DEBUG: Failed to calculate full image context extraction: {e}")
             return None
 
-    def _extract_context_region(self, image, context_info):
-        """Extract context region and scale to optimal OpenAI shape"""
+    def _extract_context_region(self, image, context_info, encode_async=False):
+        """Extract context region and scale to optimal OpenAI shape.
+
+        With encode_async=True the returned data is a Future resolving to the
+        PNG bytes; the GIMP export still runs synchronously on the calling
+        thread, only the file read is deferred to _EXPORT_POOL.
+        """
         try:
-            print("DEBUG: Extracting context region for AI with optimal shape")
+            _debug("DEBUG: Extracting context region for AI with optimal shape")
 
             # Get parameters for the extract region
             ctx_x1, ctx_y1, ctx_width, ctx_height = context_info["extract_region"]
             target_shape = context_info["target_shape"]
             target_width, target_height = target_shape
-            orig_width = image.get_width()
-            orig_height = image.get_height()
+            image_state = context_info.get("image_state")
+            if image_state is None:
+                image_state = self._gather_image_state(image)
+            orig_width = image_state.width
+            orig_height = image_state.height
 
-            print(
+            _debug(
                 f"DEBUG: Extract region: ({ctx_x1},{ctx_y1}) to ({ctx_x1+ctx_width},{ctx_y1+ctx_height}) size={ctx_width}x{ctx_height}"
             )
-            print(f"DEBUG: Original image: {orig_width}x{orig_height}")
-            print(f"DEBUG: Target shape: {target_width}x{target_height}")
+            _debug(f"DEBUG: Original image: {orig_width}x{orig_height}")
+            _debug(f"DEBUG: Target shape: {target_width}x{target_height}")
 
             # Create a new canvas with the extract region size
             extract_image = Gimp.Image.new(ctx_width, ctx_height, image.get_base_type())
@@ -227,17 +494,25 @@ class InpaintMixin:
             intersect_width = intersect_x2 - intersect_x1
             intersect_height = intersect_y2 - intersect_y1
 
-            print(
+            _debug(
                 f"DEBUG: Image intersection: ({intersect_x1},{intersect_y1}) to ({intersect_x2},{intersect_y2})"
             )
-            print(f"DEBUG: Intersection size: {intersect_width}x{intersect_height}")
+            _debug(f"DEBUG: Intersection size: {intersect_width}x{intersect_height}")
 
             if intersect_width > 0 and intersect_height > 0:
-                # Create a temporary image with just the intersecting region
+                # Create a temporary image with just the intersecting region.
+                # Full-image extracts intersect the whole canvas, so the crop
+                # would be a no-op - skip the extra pass in that case.
                 temp_image = image.duplicate()
-                temp_image.crop(
-                    intersect_width, intersect_height, intersect_x1, intersect_y1
-                )
+                if (
+                    intersect_x1 != 0
+                    or intersect_y1 != 0
+                    or intersect_width != orig_width
+                    or intersect_height != orig_height
+                ):
+                    temp_image.crop(
+                        intersect_width, intersect_height, intersect_x1, intersect_y1
+                    )
 
                 # Create a layer from this region
                 merged_layer = temp_image.merge_visible_layers(
@@ -258,14 +533,14 @@ class InpaintMixin:
                 paste_y = intersect_y1 - ctx_y1  # Offset within the extract region
                 layer_copy.set_offsets(paste_x, paste_y)
 
-                print(
+                _debug(
                     f"DEBUG: Placed image content at offset ({paste_x},{paste_y}) within extract region"
                 )
 
                 # Clean up temp image
                 temp_image.delete()
             else:
-                print(
+                _debug(
                     "DEBUG: No intersection with original image - creating empty extract region"
                 )
 
@@ -278,17 +553,17 @@ class InpaintMixin:
                     scaled_w, scaled_h = padding_info["scaled_size"]
                     pad_left, pad_top, pad_right, pad_bottom = padding_info["padding"]
 
-                    print(f"DEBUG: Using aspect-ratio preserving scaling:")
-                    print(f"  Scale factor: {scale_factor}")
-                    print(f"  Scaled size: {scaled_w}x{scaled_h}")
-                    print(
+                    _debug(f"DEBUG: Using aspect-ratio preserving scaling:")
+                    _debug(f"  Scale factor: {scale_factor}")
+                    _debug(f"  Scaled size: {scaled_w}x{scaled_h}")
+                    _debug(
                         f"  Padding: left={pad_left}, top={pad_top}, right={pad_right}, bottom={pad_bottom}"
                     )
 
                     # First scale preserving aspect ratio
                     if scale_factor != 1.0:
                         extract_image.scale(scaled_w, scaled_h)
-                        print(
+                        _debug(
                             f"DEBUG: Scaled to {scaled_w}x{scaled_h} preserving aspect ratio"
                         )
 
@@ -298,7 +573,7 @@ class InpaintMixin:
                         extract_image.resize(
                             target_width, target_height, pad_left, pad_top
                         )
-                        print(
+                        _debug(
                             f"DEBUG: Added padding to reach {target_width}x{target_height}"
                         )
                 else:
@@ -310,9 +585,9 @@ class InpaintMixin:
                     scaled_w, scaled_h = padding_info["scaled_size"]
                     pad_left, pad_top, pad_right, pad_bottom = padding_info["padding"]
 
-                    print(f"DEBUG: Calculating padding on the fly:")
-                    print(f"  Scale factor: {scale_factor}")
-                    print(
+                    _debug(f"DEBUG: Calculating padding on the fly:")
+                    _debug(f"  Scale factor: {scale_factor}")
+                    _debug(
                         f"  Padding: left={pad_left}, top={pad_top}, right={pad_right}, bottom={pad_bottom}"
                     )
 
@@ -322,71 +597,78 @@ class InpaintMixin:
                     # Then add padding
                     extract_image.resize(target_width, target_height, pad_left, pad_top)
 
-                print(
+                _debug(
                     f"DEBUG: Final extract image size: {target_width}x{target_height} (aspect ratio preserved)"
                 )
 
             # Export to PNG
-            with tempfile.NamedTemporaryFile(suffix=".png", delete=False) as temp_file:
+            with tempfile.NamedTemporaryFile(
+                suffix=".png", delete=False, dir=_RAM_TMPDIR
+            ) as temp_file:
                 temp_filename = temp_file.name
 
             try:
                 # Export using GIMP's PNG export
                 file = Gio.File.new_for_path(temp_filename)
 
-                pdb_proc = Gimp.get_pdb().lookup_procedure("file-png-export")
-                pdb_config = pdb_proc.create_config()
-                pdb_config.set_property("run-mode", Gimp.RunMode.NONINTERACTIVE)
+                pdb_proc, pdb_config = self._png_export_config()
                 pdb_config.set_property("image", extract_image)
                 pdb_config.set_property("file", file)
-                pdb_config.set_property("options", None)
 
                 result = pdb_proc.run(pdb_config)
                 if result.index(0) != Gimp.PDBStatusType.SUCCESS:
-                    print(f"DEBUG: PNG export failed: {result.index(0)}")
+                    _debug(f"DEBUG: PNG export failed: {result.index(0)}")
                     extract_image.delete()
                     return False, "PNG export failed", None
 
-                # Read the exported file and encode to base64
+                if encode_async:
+                    # All GIMP work is done; hand the file read to the export
+                    # pool so it overlaps the mask creation that follows on
+                    # the main thread.
+                    extract_image.delete()
+                    future = _EXPORT_POOL.submit(_read_png_unlink, temp_filename)
+                    info = "Extracted context region (file read in background)"
+                    _debug(f"DEBUG: {info}")
+                    return True, info, future
+
+                # Read the exported file
                 with open(temp_filename, "rb") as f:
                     png_data = f.read()
 
-                base64_data = base64.b64encode(png_data).decode("utf-8")
-
                 # Clean up
                 os.unlink(temp_filename)
                 extract_image.delete()
 
-                info = f"Extracted context region: {len(png_data)} bytes as PNG, base64 length: {len(base64_data)}"
-                print(f"DEBUG: {info}")
-                return True, info, base64_data
+                info = f"Extracted context region: {len(png_data)} bytes as PNG"
+                _debug(f"DEBUG: {info}")
+                return True, info, png_data
 
             except Exception as e:
-                print(f"DEBUG: Context extraction export failed: {e}")
+                _debug(f"DEBUG: Context extraction export failed: {e}")
                 if os.path.exists(temp_filename):
                     os.unlink(temp_filename)
                 extract_image.delete()
                 return False, f"Export failed: {str(e)}", None
 
         except Exception as e:
-            print(f"DEBUG: Context extraction failed: {e}")
+            _debug(f"DEBUG: Context extraction failed: {e}")
             return False, f"Context extraction error: {str(e)}", None
 
     def _prepare_full_image(self, image):
         """Prepare full image for GPT-Image-1 processing with optimal shape"""
         try:
-            print("DEBUG: Preparing full image for transformation with optimal shape")
+            _debug("DEBUG: Preparing full image for transformation with optimal shape")
 
             width = image.get_width()
             height = image.get_height()
 
-            print(f"DEBUG: Original image size: {width}x{height}")
+            _debug(f"DEBUG: Original image size: {width}x{height}")
 
             # Get optimal OpenAI shape for this image
             target_shape = get_optimal_openai_shape(width, height)
             target_width, target_height = target_shape
 
-            print(
+            _debug(
                 f"DEBUG: Optimal OpenAI shape selected: {target_width}x{target_height}"
             )
 
@@ -397,8 +679,8 @@ class InpaintMixin:
             scale = padding_info["scale_factor"]
             scaled_width, scaled_height = padding_info["scaled_size"]
 
-            print(f"DEBUG: Scale factor: {scale:.3f}")
-            print(f"DEBUG: Scaled size: {scaled_width}x{scaled_height}")
+            _debug(f"DEBUG: Scale factor: {scale:.3f}")
+            _debug(f"DEBUG: Scaled size: {scaled_width}x{scaled_height}")
 
             # Create context_info with both old and new format for compatibility
             context_info = {
@@ -419,7 +701,7 @@ class InpaintMixin:
             return context_info
 
         except Exception as e:
-            print(f"DEBUG: Full image preparation failed: {e}")
+            _debug(f"DEBUG: Full image preparation failed: {e}")
             # Fallback to square
             return {
                 "mode": "full_image",
@@ -435,7 +717,7 @@ class InpaintMixin:
         """Extract and scale the full image for GPT-Image-1"""
         try:
             target_width, target_height = context_info["scaled_size"]
-            print(
+            _debug(
                 f"DEBUG: Extracting full image, scaling to {target_width}x{target_height}"
             )
 
@@ -460,19 +742,18 @@ class InpaintMixin:
             temp_image.scale(target_width, target_height)
 
             # Export to PNG in memory
-            print("DEBUG: Exporting full image as PNG...")
+            _debug("DEBUG: Exporting full image as PNG...")
 
-            with tempfile.NamedTemporaryFile(suffix=".png", delete=False) as temp_file:
+            with tempfile.NamedTemporaryFile(
+                suffix=".png", delete=False, dir=_RAM_TMPDIR
+            ) as temp_file:
                 temp_path = temp_file.name
 
             # Use GIMP's export function like the existing code
             file = Gio.File.new_for_path(temp_path)
-            pdb_proc = Gimp.get_pdb().lookup_procedure("file-png-export")
-            pdb_config = pdb_proc.create_config()
-            pdb_config.set_property("run-mode", Gimp.RunMode.NONINTERACTIVE)
+            pdb_proc, pdb_config = self._png_export_config()
             pdb_config.set_property("image", temp_image)
             pdb_config.set_property("file", file)
-            pdb_config.set_property("options", None)
             result = pdb_proc.run(pdb_config)
 
             if result.index(0) != Gimp.PDBStatusType.SUCCESS:
@@ -487,20 +768,15 @@ class InpaintMixin:
             os.unlink(temp_path)
             temp_image.delete()
 
-            # Convert to base64 for API
-            image_data = base64.b64encode(image_bytes).decode("utf-8")
-
-            print(
-                f"DEBUG: Full image extracted: {len(image_bytes)} bytes, base64 length: {len(image_data)}"
-            )
+            _debug(f"DEBUG: Full image extracted: {len(image_bytes)} bytes")
             return (
                 True,
-                f"Extracted full image: {len(image_bytes)} bytes as PNG, base64 length: {len(image_data)}",
-                image_data,
+                f"Extracted full image: {len(image_bytes)} bytes as PNG",
+                image_bytes,
             )
 
         except Exception as e:
-            print(f"DEBUG: Full image extraction failed: {e}")
+            _debug(f"DEBUG: Full image extraction failed: {e}")
             return False, f"Full image extraction failed: {str(e)}", None
 
     def _create_full_size_mask_then_scale(self, image, selection_channel, context_info):
@@ -518,115 +794,111 @@ class InpaintMixin:
             ctx_x1, ctx_y1, ctx_w, ctx_h = context_info["extract_region"]
             mask_base_width = ctx_w
             mask_base_height = ctx_h
-            print(
+            _debug(
                 f"DEBUG: Creating mask in extract-region coords {mask_base_width}x{mask_base_height} (ctx origin {ctx_x1},{ctx_y1}), then scaling/padding like image"
             )
 
-            # Use the EXISTING working mask creation logic, but at correct base size
+            # Use the EXISTING working mask creation logic, but at correct base size.
+            # The mask only carries black/white + alpha, so build it as grayscale:
+            # every GEGL pass before PNG export then touches 2 bytes/pixel
+            # instead of 4.
             mask_image = Gimp.Image.new(
-                mask_base_width, mask_base_height, Gimp.ImageBaseType.RGB
+                mask_base_width, mask_base_height, Gimp.ImageBaseType.GRAY
             )
             mask_layer = Gimp.Layer.new(
                 mask_image,
                 "selection_mask",
                 mask_base_width,
                 mask_base_height,
-                Gimp.ImageType.RGBA_IMAGE,
+                Gimp.ImageType.GRAYA_IMAGE,
                 100.0,
                 Gimp.LayerMode.NORMAL,
             )
             mask_image.insert_layer(mask_layer, None, 0)
 
             # Fill with black (preserve areas)
-            black_color = Gegl.Color.new("black")
-            Gimp.context_set_foreground(black_color)
+            Gimp.context_set_foreground(_gegl_black())
             mask_layer.edit_fill(Gimp.FillType.FOREGROUND)
 
             # Copy selection shape exactly as the working code does
             selection_buffer = selection_channel.get_buffer()
             mask_shadow_buffer = mask_layer.get_shadow_buffer()
 
-            # Use the WORKING Gegl approach from the existing code
-            graph = Gegl.Node()
-
-            mask_source = graph.create_child("gegl:buffer-source")
-            mask_source.set_property("buffer", mask_layer.get_buffer())
-
-            selection_source = graph.create_child("gegl:buffer-source")
-            selection_source.set_property("buffer", selection_buffer)
-
-            # Translate the selection channel into extract-region space
-            translate = graph.create_child("gegl:translate")
-            translate.set_property("x", float(-ctx_x1))
-            translate.set_property("y", float(-ctx_y1))
-            selection_source.link(translate)
-
-            composite = graph.create_child("gegl:over")
-            output = graph.create_child("gegl:write-buffer")
-            output.set_property("buffer", mask_shadow_buffer)
+            # Pre-size the shadow buffer so its tiles are reserved up front
+            # instead of growing tile-by-tile while the graph writes into it
+            mask_shadow_buffer.set_extent(
+                Gegl.Rectangle.new(0, 0, mask_base_width, mask_base_height)
+            )
 
-            mask_source.link(composite)
-            translate.connect_to("output", composite, "aux")
-            composite.link(output)
+            # Composite the selection (translated into extract-region space)
+            # over the black mask using the cached graph template
+            output = _MASK_GRAPHS.composite(
+                mask_layer.get_buffer(),
+                selection_buffer,
+                -ctx_x1,
+                -ctx_y1,
+                mask_shadow_buffer,
+            )
             output.process()
 
             mask_shadow_buffer.flush()
             mask_layer.merge_shadow(True)
-            mask_layer.update(0, 0, mask_base_width, mask_base_height)
 
             # Mask polarity differs by backend:
             # - OpenAI edits: selection areas should be transparent (inpaint area)
             # - ComfyUI workflows often use LoadImage mask output (alpha) where white=edit.
             #   For ComfyUI we make the *background* transparent and keep selection opaque.
-            transparency_graph = Gegl.Node()
             layer_buffer = mask_layer.get_buffer()
             shadow_buffer = mask_layer.get_shadow_buffer()
 
-            buffer_source = transparency_graph.create_child("gegl:buffer-source")
-            buffer_source.set_property("buffer", layer_buffer)
-
-            color_to_alpha = transparency_graph.create_child("gegl:color-to-alpha")
-            # Make background transparent; selection remains opaque white (ComfyUI behavior).
-            target_color = Gegl.Color.new("black")
-            color_to_alpha.set_property("color", target_color)
-
-            buffer_write = transparency_graph.create_child("gegl:write-buffer")
-            buffer_write.set_property("buffer", shadow_buffer)
+            # Same up-front tile reservation for the transparency pass
+            shadow_buffer.set_extent(
+                Gegl.Rectangle.new(0, 0, mask_base_width, mask_base_height)
+            )
 
-            buffer_source.link(color_to_alpha)
-            color_to_alpha.link(buffer_write)
+            buffer_write = _MASK_GRAPHS.transparency(layer_buffer, shadow_buffer)
             buffer_write.process()
 
             shadow_buffer.flush()
             mask_layer.merge_shadow(True)
-            mask_layer.update(0, 0, mask_base_width, mask_base_height)
 
-            print(
+            # Unpin the mask buffers from the cached graphs right away so the
+            # tiles can be freed during the upcoming ComfyUI round-trip
+            _MASK_GRAPHS.release()
+
+            _debug(
                 "DEBUG: Created mask with transparent background and opaque selection (ComfyUI)"
             )
 
             # NOW scale using SAME operations as image
             if scale_factor != 1.0:
-                mask_image.scale(scaled_w, scaled_h)
-                print(f"DEBUG: Scaled mask to {scaled_w}x{scaled_h}")
+                # Scale with nearest neighbor: keeps the mask binary (the default
+                # cubic sampler produces gray anti-aliased edges that ComfyUI
+                # interprets ambiguously) and is much cheaper per pixel.
+                previous_interpolation = Gimp.context_get_interpolation()
+                Gimp.context_set_interpolation(Gimp.InterpolationType.NONE)
+                try:
+                    mask_image.scale(scaled_w, scaled_h)
+                finally:
+                    Gimp.context_set_interpolation(previous_interpolation)
+                _debug(f"DEBUG: Scaled mask to {scaled_w}x{scaled_h} (nearest neighbor)")
 
             if pad_left > 0 or pad_top > 0 or pad_right > 0 or pad_bottom > 0:
                 mask_image.resize(target_width, target_height, pad_left, pad_top)
-                print(
+                _debug(
                     f"DEBUG: Added padding to mask to reach {target_width}x{target_height}"
                 )
 
             # Export (same as working code)
-            with tempfile.NamedTemporaryFile(suffix=".png", delete=False) as temp_file:
+            with tempfile.NamedTemporaryFile(
+                suffix=".png", delete=False, dir=_RAM_TMPDIR
+            ) as temp_file:
                 temp_filename = temp_file.name
 
             file = Gio.File.new_for_path(temp_filename)
-            pdb_proc = Gimp.get_pdb().lookup_procedure("file-png-export")
-            pdb_config = pdb_proc.create_config()
-            pdb_config.set_property("run-mode", Gimp.RunMode.NONINTERACTIVE)
+            pdb_proc, pdb_config = self._png_export_config()
             pdb_config.set_property("image", mask_image)
             pdb_config.set_property("file", file)
-            pdb_config.set_property("options", None)
 
             result = pdb_proc.run(pdb_config)
 
@@ -643,11 +915,11 @@ class InpaintMixin:
             mask_image.delete()
             image.remove_channel(selection_channel)
 
-            print(f"DEBUG: Created full-size-then-scaled mask: {len(png_data)} bytes")
+            _debug(f"DEBUG: Created full-size-then-scaled mask: {len(png_data)} bytes")
             return png_data
 
         except Exception as e:
-            print(f"DEBUG: Full size mask creation failed: {e}")
+            _debug(f"DEBUG: Full size mask creation failed: {e}")
             if "mask_image" in locals():
                 mask_image.delete()
             if "selection_channel" in locals():
@@ -659,7 +931,7 @@ class InpaintMixin:
         try:
             target_shape = context_info.get("target_shape", (target_size, target_size))
             target_width, target_height = target_shape
-            print(
+            _debug(
                 f"DEBUG: Creating pixel-perfect selection mask {target_width}x{target_height}"
             )
 
@@ -670,7 +942,7 @@ class InpaintMixin:
 
             # Get extract region info
             ctx_x1, ctx_y1, ctx_width, ctx_height = context_info["extract_region"]
-            print(
+            _debug(
                 f"DEBUG: Extract region: ({ctx_x1},{ctx_y1}) size {ctx_width}x{ctx_height}"
             )
 
@@ -678,7 +950,7 @@ class InpaintMixin:
             selection_channel = Gimp.Selection.save(image)
             if not selection_channel:
                 raise Exception("Failed to save selection as channel")
-            print("DEBUG: Saved selection as channel for pixel copying")
+            _debug("DEBUG: Saved selection as channel for pixel copying")
 
             # For any mode with padding, use simplified approach that mirrors image processing
             if "padding_info" in context_info:
@@ -710,24 +982,17 @@ class InpaintMixin:
 
             mask_image.insert_layer(mask_layer, None, 0)
 
-            # Fill with black background (preserve all areas initially)
-            black_color = Gegl.Color.new("black")
-            Gimp.context_set_foreground(black_color)
-            mask_layer.edit_fill(Gimp.FillType.FOREGROUND)
-            print("DEBUG: Created black background mask (preserve all areas)")
-
-            # Force layer update to make sure black fill is committed
-            mask_layer.update(0, 0, target_width, target_height)
-
-            # Explicitly ensure extension areas stay black by filling the entire target area
-            print(
-                f"DEBUG: Ensuring all extension areas are black in {target_width}x{target_height} mask"
-            )
+            # Fill with transparent background (ComfyUI polarity: transparent = ignore)
+            mask_layer.edit_fill(Gimp.FillType.TRANSPARENT)
+            _debug("DEBUG: Created transparent background mask (preserve all areas)")
 
             # Step 3: Copy only the original image area, leave extended context white
 
             # Calculate where original image appears in context square
-            orig_width, orig_height = image.get_width(), image.get_height()
+            image_state = context_info.get("image_state")
+            if image_state is None:
+                image_state = self._gather_image_state(image)
+            orig_width, orig_height = image_state.width, image_state.height
             img_offset_x = max(
                 0, -ctx_x1
             )  # where original image starts in context square
@@ -750,7 +1015,7 @@ class InpaintMixin:
                     int(orig_height * scale_factor),
                 )
 
-                print(
+                _debug(
                     f"DEBUG: Accounting for padding in mask - scale={scale_factor}, padding=({pad_left},{pad_top},{pad_right},{pad_bottom})"
                 )
             else:
@@ -762,10 +1027,39 @@ class InpaintMixin:
                     ctx_height, orig_height - ctx_y1 if ctx_y1 >= 0 else orig_height
                 )
 
-            print(
+            _debug(
                 f"DEBUG: Original image appears at ({img_offset_x},{img_offset_y}) to ({img_end_x},{img_end_y}) in context square"
             )
 
+            # Fast path: if the selection blankets the whole extract region,
+            # the finished mask is simply fully opaque - no compositing needed.
+            # The bounds check is free; the histogram confirms there are no
+            # unselected or feathered pixels hiding inside the bounding box.
+            if (
+                image_state.sel_x1 <= ctx_x1
+                and image_state.sel_y1 <= ctx_y1
+                and image_state.sel_x2 >= ctx_x1 + ctx_width
+                and image_state.sel_y2 >= ctx_y1 + ctx_height
+            ):
+                try:
+                    histogram = selection_channel.histogram(
+                        Gimp.HistogramChannel.VALUE, 0.0, 1.0
+                    )
+                    # (success, mean, std_dev, median, pixels, count, percentile)
+                    if histogram[0] and histogram[1] >= 1.0 and histogram[2] == 0.0:
+                        mask_layer.edit_fill(Gimp.FillType.WHITE)
+                        _debug(
+                            "DEBUG: Selection covers entire extract region - "
+                            "using solid opaque mask fast path"
+                        )
+                        return self._export_mask_image(
+                            mask_image, image, selection_channel
+                        )
+                except Exception as fast_path_error:
+                    _debug(
+                        f"DEBUG: Full-cover fast path check failed, using graph: {fast_path_error}"
+                    )
+
             # Only process if there's an intersection
             if img_end_x > img_offset_x and img_end_y > img_offset_y:
                 # Get buffers for pixel-level operations
@@ -781,7 +1075,7 @@ class InpaintMixin:
                     image.remove_channel(selection_channel)
                     raise Exception("Failed to get mask shadow buffer")
 
-                print("DEBUG: Starting Gegl pixel copying from selection channel")
+                _debug("DEBUG: Starting Gegl pixel copying from selection channel")
 
                 # Create Gegl processing graph for selection shape copying
                 graph = Gegl.Node()
@@ -795,23 +1089,22 @@ class InpaintMixin:
                 selection_source.set_property("buffer", selection_buffer)
 
                 # Scale selection if needed to match the final image scaling
+                # Identity transforms are skipped outright: even a no-op GEGL
+                # node forces an extra resample/copy of every tile it sees.
+                selection_input = selection_source
                 if "padding_info" in context_info:
                     padding_info = context_info["padding_info"]
                     scale_factor = padding_info["scale_factor"]
 
                     if abs(scale_factor - 1.0) > 0.001:  # Need scaling
-                        print(
+                        _debug(
                             f"DEBUG: Scaling selection channel by factor {scale_factor}"
                         )
                         scale_op = graph.create_child("gegl:scale-ratio")
                         scale_op.set_property("x", float(scale_factor))
                         scale_op.set_property("y", float(scale_factor))
-                        selection_source.link(scale_op)
+                        selection_input.link(scale_op)
                         selection_input = scale_op
-                    else:
-                        selection_input = selection_source
-                else:
-                    selection_input = selection_source
 
                 # Translate selection to correct position in padded target shape
                 # For full image with padding, the selection has been scaled and needs padding offset
@@ -823,7 +1116,7 @@ class InpaintMixin:
                     translate_x = pad_left
                     translate_y = pad_top
 
-                    print(
+                    _debug(
                         f"DEBUG: Mask translation for padded image: translate by ({translate_x},{translate_y})"
                     )
                 else:
@@ -831,15 +1124,22 @@ class InpaintMixin:
                     translate_x = -ctx_x1
                     translate_y = -ctx_y1
 
-                translate = graph.create_child("gegl:translate")
-                translate.set_property("x", float(translate_x))
-                translate.set_property("y", float(translate_y))
-
-                # Connect scaled selection through translate to composite
-                selection_input.link(translate)
-
-                # Composite the translated selection over the black background
-                # This preserves the black background in extension areas
+                if translate_x or translate_y:
+                    translate = graph.create_child("gegl:translate")
+                    translate.set_property("x", float(translate_x))
+                    translate.set_property("y", float(translate_y))
+                    selection_input.link(translate)
+                    selection_input = translate
+
+                # Knock out the unselected (black) parts of the channel so only
+                # the selection shape lands on the canvas as opaque pixels
+                color_to_alpha = graph.create_child("gegl:color-to-alpha")
+                color_to_alpha.set_property("color", _gegl_black())
+                selection_input.link(color_to_alpha)
+
+                # Composite the selection shape over the transparent background
+                # This keeps extension areas transparent (ignore) while the
+                # selection stays opaque (edit) - the final ComfyUI polarity
                 composite = graph.create_child("gegl:over")
 
                 # Write to mask shadow buffer
@@ -847,134 +1147,92 @@ class InpaintMixin:
                 output.set_property("buffer", mask_shadow_buffer)
 
                 # Link the processing chain:
-                # mask_source (black bg) + translated_selection → composite → output
-                selection_source.link(translate)
+                # mask_source (transparent bg) + selection shape → composite → output
                 mask_source.link(composite)
-                translate.connect_to("output", composite, "aux")
+                color_to_alpha.connect_to("output", composite, "aux")
                 composite.link(output)
 
-                print(
-                    f"DEBUG: Compositing selection over black background: translate by ({translate_x},{translate_y})"
+                _debug(
+                    f"DEBUG: Compositing selection shape in one pass: translate by ({translate_x},{translate_y})"
                 )
 
-                # Process the graph to composite selection shape over black background
+                # Process the graph - single pass produces the final mask polarity
                 output.process()
-                print(
-                    "DEBUG: Successfully composited selection shape over black background preserving extension areas"
+                _debug(
+                    "DEBUG: Successfully composited selection shape with transparent extension areas"
                 )
 
                 # Flush and merge shadow buffer to make changes visible
                 mask_shadow_buffer.flush()
                 mask_layer.merge_shadow(True)
-                print("DEBUG: Merged shadow buffer with base layer")
+                _debug("DEBUG: Merged shadow buffer with base layer")
             else:
-                print("DEBUG: No intersection - mask remains fully white")
+                _debug("DEBUG: No intersection - mask remains fully transparent")
 
-            # Force complete layer update
-            mask_layer.update(0, 0, target_width, target_height)
-
-            # Force flush all changes to ensure PNG export sees the correct data
-            Gimp.displays_flush()
-
-            print("DEBUG: Successfully copied exact selection shape to mask using Gegl")
+            _debug("DEBUG: Successfully copied exact selection shape to mask using Gegl")
 
             # Step 4: Mask is already at target shape, no scaling needed
             # (Previous version scaled square masks, but we now create masks at target shape)
-            print(f"DEBUG: Mask created at target shape {target_width}x{target_height}")
-
-            # Step 4.5: Make selection areas transparent (the one simple change requested)
-            # Current state: black background, white selection copied from channel
-            # Needed: black background (preserve), transparent selection (inpaint)
-            print("DEBUG: Making background transparent for ComfyUI mask polarity")
-            scaled_mask_layer = mask_image.get_layers()[0]
-
-            # Create a simple color-to-alpha operation to make selection areas transparent
-            transparency_graph = Gegl.Node()
-
-            # Get layer buffer
-            layer_buffer = scaled_mask_layer.get_buffer()
-            shadow_buffer = scaled_mask_layer.get_shadow_buffer()
-
-            # Source buffer
-            buffer_source = transparency_graph.create_child("gegl:buffer-source")
-            buffer_source.set_property("buffer", layer_buffer)
-
-            # Convert a target color to alpha: black(background) -> transparent (selection stays opaque)
-            color_to_alpha = transparency_graph.create_child("gegl:color-to-alpha")
-            target_color = Gegl.Color.new("black")
-            color_to_alpha.set_property("color", target_color)
-
-            # Output buffer
-            buffer_write = transparency_graph.create_child("gegl:write-buffer")
-            buffer_write.set_property("buffer", shadow_buffer)
-
-            # Process: source → color-to-alpha → output
-            buffer_source.link(color_to_alpha)
-            color_to_alpha.link(buffer_write)
-            buffer_write.process()
-
-            # Merge changes
-            shadow_buffer.flush()
-            scaled_mask_layer.merge_shadow(True)
-            scaled_mask_layer.update(0, 0, target_size, target_size)
-
-            print(
-                "DEBUG: Background is now transparent (ignore), selection remains opaque (edit) for ComfyUI"
-            )
+            # The transparency polarity is baked into the compositing graph above,
+            # so no second color-to-alpha pass over the buffer is needed.
+            _debug(f"DEBUG: Mask created at target shape {target_width}x{target_height}")
 
             # Step 5: Export as PNG for OpenAI
-            with tempfile.NamedTemporaryFile(suffix=".png", delete=False) as temp_file:
-                temp_filename = temp_file.name
+            return self._export_mask_image(mask_image, image, selection_channel)
 
-            try:
-                file = Gio.File.new_for_path(temp_filename)
+        except Exception as e:
+            _debug(f"DEBUG: Context mask creation failed: {e}")
+            raise Exception(f"Selection-shaped mask creation failed: {str(e)}")
 
-                pdb_proc = Gimp.get_pdb().lookup_procedure("file-png-export")
-                pdb_config = pdb_proc.create_config()
-                pdb_config.set_property("run-mode", Gimp.RunMode.NONINTERACTIVE)
-                pdb_config.set_property("image", mask_image)
-                pdb_config.set_property("file", file)
-                pdb_config.set_property("options", None)
+    def _export_mask_image(self, mask_image, image, selection_channel):
+        """Export a finished mask image as PNG bytes and clean up the scratch data."""
+        with tempfile.NamedTemporaryFile(
+            suffix=".png", delete=False, dir=_RAM_TMPDIR
+        ) as temp_file:
+            temp_filename = temp_file.name
 
-                result = pdb_proc.run(pdb_config)
-                if result.index(0) != Gimp.PDBStatusType.SUCCESS:
-                    mask_image.delete()
-                    image.remove_channel(selection_channel)
-                    raise Exception(f"PNG export failed with status: {result.index(0)}")
-
-                # Read the exported mask PNG
-                with open(temp_filename, "rb") as f:
-                    png_data = f.read()
+        try:
+            file = Gio.File.new_for_path(temp_filename)
 
-                if len(png_data) == 0:
-                    raise Exception("Exported PNG file is empty")
+            pdb_proc, pdb_config = self._png_export_config()
+            pdb_config.set_property("image", mask_image)
+            pdb_config.set_property("file", file)
 
-                # Clean up
-                os.unlink(temp_filename)
+            result = pdb_proc.run(pdb_config)
+            if result.index(0) != Gimp.PDBStatusType.SUCCESS:
                 mask_image.delete()
                 image.remove_channel(selection_channel)
+                raise Exception(f"PNG export failed with status: {result.index(0)}")
 
-                print(
-                    f"DEBUG: Created pixel-perfect selection mask PNG: {len(png_data)} bytes"
-                )
-                return png_data
+            # Read the exported mask PNG
+            with open(temp_filename, "rb") as f:
+                png_data = f.read()
 
-            except Exception as e:
-                print(f"DEBUG: Mask export failed: {e}")
-                if os.path.exists(temp_filename):
-                    os.unlink(temp_filename)
-                mask_image.delete()
-                image.remove_channel(selection_channel)
-                raise Exception(f"Mask export failed: {str(e)}")
+            if len(png_data) == 0:
+                raise Exception("Exported PNG file is empty")
+
+            # Clean up
+            os.unlink(temp_filename)
+            mask_image.delete()
+            image.remove_channel(selection_channel)
+
+            _debug(
+                f"DEBUG: Created pixel-perfect selection mask PNG: {len(png_data)} bytes"
+            )
+            return png_data
 
         except Exception as e:
-            print(f"DEBUG: Context mask creation failed: {e}")
-            raise Exception(f"Selection-shaped mask creation failed: {str(e)}")
+            _debug(f"DEBUG: Mask export failed: {e}")
+            if os.path.exists(temp_filename):
+                os.unlink(temp_filename)
+            mask_image.delete()
+            image.remove_channel(selection_channel)
+            raise Exception(f"Mask export failed: {str(e)}")
 
     def _apply_smart_mask_feathering(self, mask, image):
         """Apply smart feathering to mask edges for better blending while preserving selection size"""
         try:
-            print("DEBUG: Applying smart mask feathering for enhanced edge blending")
+            _debug("DEBUG: Applying smart mask feathering for enhanced edge blending")
 
             # Get mask dimensions and buffer
             mask_width = mask.get_width()
@@ -982,82 +1240,56 @@ class InpaintMixin:
             mask_buffer = mask.get_buffer()
             shadow_buffer = mask.get_shadow_buffer()
 
-            print(f"DEBUG: Processing mask {mask_width}x{mask_height}")
+            _debug(f"DEBUG: Processing mask {mask_width}x{mask_height}")
 
             # Simplified approach: Apply graduated gaussian blur
-            # This softens edges without changing the overall selection area
-            graph = Gegl.Node()
-
-            # Source: Current mask buffer
-            source = graph.create_child("gegl:buffer-source")
-            source.set_property("buffer", mask_buffer)
-
-            # Apply moderate gaussian blur to soften edges
-            # Use smaller blur to maintain selection size while softening transitions
-            blur = graph.create_child("gegl:gaussian-blur")
-            blur.set_property("std-dev-x", 4.0)  # Moderate blur for edge softening
-            blur.set_property("std-dev-y", 4.0)
-
-            # Output to shadow buffer
-            output = graph.create_child("gegl:write-buffer")
-            output.set_property("buffer", shadow_buffer)
-
-            # Link the chain: source -> blur -> output
-            source.link(blur)
-            blur.link(output)
+            # This softens edges without changing the overall selection area.
+            # Use smaller blur to maintain selection size while softening
+            # transitions; run it at half resolution since the result gets
+            # blurred anyway (falls back to the full-res graph on failure).
+            output = _MASK_GRAPHS.feather_pyramid(mask_buffer, shadow_buffer, 4.0)
 
             # Process the graph
-            print("DEBUG: Processing edge feathering...")
+            _debug("DEBUG: Processing edge feathering...")
             output.process()
 
             # Merge changes
             shadow_buffer.flush()
             mask.merge_shadow(True)
             mask.update(0, 0, mask_width, mask_height)
+            _MASK_GRAPHS.release()
 
-            print(
+            _debug(
                 "DEBUG: Smart edge feathering applied - edges softened while preserving selection area"
             )
 
         except Exception as e:
-            print(f"DEBUG: Smart mask feathering failed (using simple feathering): {e}")
+            _debug(f"DEBUG: Smart mask feathering failed (using simple feathering): {e}")
             # Fallback: apply light gaussian blur to entire mask
             try:
                 mask_buffer = mask.get_buffer()
                 shadow_buffer = mask.get_shadow_buffer()
 
                 # Simple fallback: light gaussian blur on entire mask
-                graph = Gegl.Node()
-
-                source = graph.create_child("gegl:buffer-source")
-                source.set_property("buffer", mask_buffer)
-
-                blur = graph.create_child("gegl:gaussian-blur")
-                blur.set_property("std-dev-x", 2.0)
-                blur.set_property("std-dev-y", 2.0)
-
-                output = graph.create_child("gegl:write-buffer")
-                output.set_property("buffer", shadow_buffer)
-
-                source.link(blur)
-                blur.link(output)
+                output = _MASK_GRAPHS.feather(mask_buffer, shadow_buffer, 2.0)
                 output.process()
 
                 shadow_buffer.flush()
                 mask.merge_shadow(True)
                 mask.update(0, 0, mask.get_width(), mask.get_height())
+                _MASK_GRAPHS.release()
 
-                print("DEBUG: Applied fallback simple feathering")
+                _debug("DEBUG: Applied fallback simple feathering")
 
             except Exception as e2:
-                print(
+                _debug(
                     f"DEBUG: Both smart and simple feathering failed, using original mask: {e2}"
                 )
 
     def _sample_boundary_colors(self, image, context_info):
         """Sample colors around selection boundary for color matching"""
         try:
-            print("DEBUG: Sampling boundary colors for color matching")
+            _debug("DEBUG: Sampling boundary colors for color matching")
 
             if not context_info.get("has_selection", False):
                 return None
@@ -1070,82 +1302,105 @@ class InpaintMixin:
             # Outer ring: just outside selection
             sample_width = min(10, (sel_x2 - sel_x1) // 10)  # Adaptive sample width
 
-            # Get the flattened image for color sampling
-            merged_layer = None
-            try:
-                # Create a temporary flattened copy for sampling
-                temp_image = image.duplicate()
-                merged_layer = temp_image.flatten()
-
-                # Sample colors using GEGL buffer operations
-                layer_buffer = merged_layer.get_buffer()
-
-                # Sample pixels around selection boundary
-                inner_samples = []
-                outer_samples = []
-
-                # Sample points along the selection perimeter
-                sample_points = 20  # Number of sample points
+            if np is None:
+                _debug("DEBUG: NumPy not available - skipping boundary color sampling")
+                return None
 
-                for i in range(sample_points):
-                    # Calculate position along selection perimeter
-                    t = i / sample_points
+            # Read whole edge strips in bulk: one buffer.get per strip
+            # instead of two per-pixel round-trips for each of the 20
+            # sample points the old loop used.
+            strip_w = max(1, sel_x2 - sel_x1)
+            strip_h = max(1, sample_width)
+
+            # Clamp all four strip origins against the canvas in one
+            # vectorized pass so every read stays inside real pixels
+            # instead of hitting the (slower) abyss-sampling path.
+            image_state = context_info.get("image_state")
+            if image_state is None:
+                image_state = self._gather_image_state(image)
+            strip_x = int(
+                np.clip(sel_x1, 0, max(0, image_state.width - strip_w))
+            )
+            # Order: inner top, inner bottom, outer top, outer bottom
+            strip_ys = np.clip(
+                np.array(
+                    [sel_y1, sel_y2 - strip_h, sel_y1 - strip_h, sel_y2]
+                ),
+                0,
+                max(0, image_state.height - strip_h),
+            )
 
-                    # Sample along top and bottom edges
-                    if i < sample_points // 2:
-                        x = int(sel_x1 + t * 2 * (sel_x2 - sel_x1))
-                        y_inner = sel_y1 + sample_width // 2
-                        y_outer = sel_y1 - sample_width // 2
-                    else:
-                        x = int(sel_x2 - (t - 0.5) * 2 * (sel_x2 - sel_x1))
-                        y_inner = sel_y2 - sample_width // 2
-                        y_outer = sel_y2 + sample_width // 2
+            # Get the flattened image for color sampling
+            temp_image = None
+            read_off_x = read_off_y = 0
+            try:
+                layers = image.get_layers()
+                if len(layers) == 1 and layers[0].get_offsets()[-2:] == (0, 0):
+                    # Single layer at the origin already is the composite -
+                    # sample it directly instead of duplicating and flattening
+                    # the whole image just to read four edge strips
+                    layer_buffer = layers[0].get_buffer()
+                    _debug("DEBUG: Single-layer image - sampling without flatten")
+                else:
+                    # Create a temporary copy for sampling, cropped down to
+                    # the strip bounding box BEFORE flattening so only the
+                    # pixels we actually read get composited
+                    temp_image = image.duplicate()
+                    crop_x = strip_x
+                    crop_y = int(strip_ys.min())
+                    crop_h = int(strip_ys.max()) + strip_h - crop_y
+                    temp_image.crop(strip_w, crop_h, crop_x, crop_y)
+                    merged_layer = temp_image.flatten()
+                    layer_buffer = merged_layer.get_buffer()
+                    read_off_x, read_off_y = crop_x, crop_y
+                    _debug(
+                        f"DEBUG: Cropped sampling copy to {strip_w}x{crop_h} before flatten"
+                    )
 
-                    # Ensure coordinates are within image bounds
-                    x = max(0, min(x, image.get_width() - 1))
-                    y_inner = max(0, min(y_inner, image.get_height() - 1))
-                    y_outer = max(0, min(y_outer, image.get_height() - 1))
+                # One boxed rectangle, mutated per read, instead of allocating
+                # a fresh Gegl.Rectangle for each of the four strips
+                strip_rect = Gegl.Rectangle.new(
+                    strip_x - read_off_x, 0, strip_w, strip_h
+                )
 
-                    try:
-                        # Sample inner color (inside selection)
-                        inner_rect = Gegl.Rectangle.new(x, y_inner, 1, 1)
-                        inner_pixel = layer_buffer.get(
-                            inner_rect, 1.0, "R'G'B'A u8", Gegl.AbyssPolicy.CLAMP
-                        )
-                        if len(inner_pixel) >= 3:
-                            inner_samples.append(
-                                (inner_pixel[0], inner_pixel[1], inner_pixel[2])
-                            )
-
-                        # Sample outer color (outside selection)
-                        outer_rect = Gegl.Rectangle.new(x, y_outer, 1, 1)
-                        outer_pixel = layer_buffer.get(
-                            outer_rect, 1.0, "R'G'B'A u8", Gegl.AbyssPolicy.CLAMP
-                        )
-                        if len(outer_pixel) >= 3:
-                            outer_samples.append(
-                                (outer_pixel[0], outer_pixel[1], outer_pixel[2])
-                            )
+                def read_strip(y):
+                    strip_rect.y = int(y) - read_off_y
+                    # Request float pixels: GIMP's working precision is float
+                    # internally, so this skips a babl requantization to u8
+                    # and hands NumPy data it can reduce without widening
+                    data = layer_buffer.get(
+                        strip_rect, 1.0, "R'G'B'A float", Gegl.AbyssPolicy.CLAMP
+                    )
+                    # Zero-copy view over the packed pixels, RGB channels only
+                    return np.frombuffer(data, dtype=np.float32).reshape(-1, 4)[:, :3]
 
-                    except Exception as sample_e:
-                        print(f"DEBUG: Sample point {i} failed: {sample_e}")
-                        continue
+                # Inner strips hug the top/bottom edges just inside the
+                # selection, outer strips just outside
+                inner_arr = np.concatenate(
+                    [read_strip(strip_ys[0]), read_strip(strip_ys[1])]
+                )
+                outer_arr = np.concatenate(
+                    [read_strip(strip_ys[2]), read_strip(strip_ys[3])]
+                )
 
                 # Calculate average colors
-                if inner_samples and outer_samples:
-                    # Calculate averages
+                if inner_arr.size and outer_arr.size:
+                    # Calculate averages (float 0..1, reported on the 0..255
+                    # scale the rest of the pipeline expects)
                     inner_avg = tuple(
-                        sum(channel) // len(inner_samples)
-                        for channel in zip(*inner_samples)
+                        int(round(v * 255.0)) for v in inner_arr.mean(axis=0)
                     )
                     outer_avg = tuple(
-                        sum(channel) // len(outer_samples)
-                        for channel in zip(*outer_samples)
+                        int(round(v * 255.0)) for v in outer_arr.mean(axis=0)
                     )
 
                     # Calculate differences for color correction
                     hue_diff = 0  # Simplified - could calculate actual hue difference
-                    brightness_diff = (sum(outer_avg) // 3) - (sum(inner_avg) // 3)
+                    # Mean over all samples and channels at once - the scalar
+                    # reduction stays inside NumPy instead of Python int math
+                    brightness_diff = int(
+                        round((outer_arr.mean() - inner_arr.mean()) * 255.0)
+                    )
 
                     color_info = {
                         "inner_avg": inner_avg,
@@ -1154,77 +1409,54 @@ class InpaintMixin:
                         "hue_diff": hue_diff,
                     }
 
-                    print(
+                    _debug(
                         f"DEBUG: Sampled colors - Inner: {inner_avg}, Outer: {outer_avg}"
                     )
-                    print(f"DEBUG: Brightness difference: {brightness_diff}")
+                    _debug(f"DEBUG: Brightness difference: {brightness_diff}")
 
                     return color_info
                 else:
-                    print("DEBUG: No valid color samples collected")
+                    _debug("DEBUG: No valid color samples collected")
                     return None
 
             finally:
-                # Clean up temporary image
-                if merged_layer and hasattr(merged_layer, "get_image"):
-                    temp_image = merged_layer.get_image()
-                    if temp_image:
-                        temp_image.delete()
+                # Clean up temporary image (only made for multi-layer images)
+                if temp_image:
+                    temp_image.delete()
 
         except Exception as e:
-            print(f"DEBUG: Color sampling failed: {e}")
+            _debug(f"DEBUG: Color sampling failed: {e}")
             return None
 
     def _apply_color_matching(self, result_layer, color_info):
         """Apply color correction to match sampled boundary colors"""
         if not color_info:
-            print("DEBUG: No color info available - skipping color matching")
+            _debug("DEBUG: No color info available - skipping color matching")
+            return
+
+        # Only worth a full-layer correction pass if the difference is
+        # noticeable; bail before touching any buffers otherwise.
+        brightness_diff = color_info.get("brightness_diff", 0)
+        if abs(brightness_diff) <= 10:
+            _debug(
+                "DEBUG: No significant brightness difference - skipping color matching"
+            )
             return
 
         try:
-            print("DEBUG: Applying color matching based on boundary samples")
+            _debug("DEBUG: Applying color matching based on boundary samples")
 
             # Get layer buffer
             layer_buffer = result_layer.get_buffer()
             shadow_buffer = result_layer.get_shadow_buffer()
 
-            # Create color correction graph
-            graph = Gegl.Node()
-
-            # Source buffer
-            source = graph.create_child("gegl:buffer-source")
-            source.set_property("buffer", layer_buffer)
-
-            # Apply brightness/levels adjustment if significant difference
-            brightness_diff = color_info.get("brightness_diff", 0)
-            if abs(brightness_diff) > 10:  # Only apply if difference is noticeable
-                levels = graph.create_child("gegl:levels")
-
-                # Adjust gamma based on brightness difference
-                gamma_adjust = 1.0 + (brightness_diff / 255.0)
-                gamma_adjust = max(0.5, min(2.0, gamma_adjust))  # Clamp gamma
-
-                levels.set_property("in-low", 0.0)
-                levels.set_property("in-high", 1.0)
-                levels.set_property("gamma", gamma_adjust)
-                levels.set_property("out-low", 0.0)
-                levels.set_property("out-high", 1.0)
-
-                source.link(levels)
-                current_node = levels
-
-                print(f"DEBUG: Applied gamma correction: {gamma_adjust}")
-            else:
-                current_node = source
-                print(
-                    "DEBUG: No significant brightness difference - skipping levels adjustment"
-                )
-
-            # Output buffer
-            output = graph.create_child("gegl:write-buffer")
-            output.set_property("buffer", shadow_buffer)
+            # Adjust gamma based on brightness difference
+            gamma_adjust = 1.0 + (brightness_diff / 255.0)
+            gamma_adjust = max(0.5, min(2.0, gamma_adjust))  # Clamp gamma
+            _debug(f"DEBUG: Applied gamma correction: {gamma_adjust}")
 
-            current_node.link(output)
+            # Cached color-correction graph, re-pointed at this layer
+            output = _MASK_GRAPHS.levels_gamma(layer_buffer, shadow_buffer, gamma_adjust)
 
             # Process color correction
             output.process()
@@ -1235,26 +1467,27 @@ class InpaintMixin:
             result_layer.update(
                 0, 0, result_layer.get_width(), result_layer.get_height()
             )
+            _MASK_GRAPHS.release()
 
-            print("DEBUG: Color matching applied successfully")
+            _debug("DEBUG: Color matching applied successfully")
 
         except Exception as e:
-            print(f"DEBUG: Color matching failed: {e}")
+            _debug(f"DEBUG: Color matching failed: {e}")
 
     def run_inpaint(self, procedure, run_mode, image, drawables, config, run_data):
-        print("DEBUG: AI Inpaint Selection called!")
+        _debug("DEBUG: AI Inpaint Selection called!")
 
         # Save the currently selected layers before any API calls that might clear them
         original_selected_layers = image.get_selected_layers()
-        print(f"DEBUG: Saved {len(original_selected_layers)} originally selected layers")
+        _debug(f"DEBUG: Saved {len(original_selected_layers)} originally selected layers")
 
         # Step 1: Check for active selection FIRST
-        print("DEBUG: Checking for active selection...")
-        selection_bounds = Gimp.Selection.bounds(image)
-        has_selection = len(selection_bounds) >= 5 and selection_bounds[0]
+        _debug("DEBUG: Checking for active selection...")
+        image_state = self._gather_image_state(image)
+        has_selection = image_state.has_selection
 
         if not has_selection:
-            print("DEBUG: No selection found - showing error message")
+            _debug("DEBUG: No selection found - showing error message")
             Gimp.message(
                 "❌ No Selection Found!\n\n"
                 "AI Inpainting requires an active selection to define the area to modify.\n\n"
@@ -1263,35 +1496,36 @@ class InpaintMixin:
                 "2. Select the area you want to inpaint\n"
                 "3. Run AI Inpaint Selection again"
             )
-            # Restore layer selection before returning
-            if original_selected_layers:
+            # Restore layer selection before returning (only if it changed;
+            # set_selected_layers dirties undo state and redraws the canvas)
+            if original_selected_layers and image.get_selected_layers() != original_selected_layers:
                 image.set_selected_layers(original_selected_layers)
-                print("DEBUG: Restored layer selection after no canvas selection error")
+                _debug("DEBUG: Restored layer selection after no canvas selection error")
             return procedure.new_return_values(Gimp.PDBStatusType.CANCEL, GLib.Error())
 
-        print("DEBUG: Selection found - proceeding with inpainting")
+        _debug("DEBUG: Selection found - proceeding with inpainting")
 
         # Step 2: Get user prompt
-        print("DEBUG: About to show prompt dialog...")
+        _debug("DEBUG: About to show prompt dialog...")
         dialog_result = self._show_prompt_dialog(
             "AI Inpaint",
             "",
             show_mode_selection=True,
             image=image,
         )
-        print(f"DEBUG: Dialog returned: {repr(dialog_result)}")
+        _debug(f"DEBUG: Dialog returned: {repr(dialog_result)}")
 
         if not dialog_result:
-            print("DEBUG: User cancelled prompt dialog")
-            # Restore layer selection before returning
-            if original_selected_layers:
+            _debug("DEBUG: User cancelled prompt dialog")
+            # Restore layer selection before returning (only if it changed)
+            if original_selected_layers and image.get_selected_layers() != original_selected_layers:
                 image.set_selected_layers(original_selected_layers)
-                print("DEBUG: Restored layer selection after dialog cancel")
+                _debug("DEBUG: Restored layer selection after dialog cancel")
             return procedure.new_return_values(Gimp.PDBStatusType.CANCEL, GLib.Error())
 
         # Extract dialog, progress_label, prompt, mode, and optional mask strength
         dialog, progress_label, prompt, selected_mode, mask_strength, seed = dialog_result
-        print(f"DEBUG: Extracted prompt: '{prompt}', mode: '{selected_mode}', seed: {seed}")
+        _debug(f"DEBUG: Extracted prompt: '{prompt}', mode: '{selected_mode}', seed: {seed}")
 
         try:
             # Step 3: Validate ComfyUI configuration
@@ -1309,19 +1543,21 @@ class InpaintMixin:
 
             # Do GIMP operations on main thread, only thread the API call
             mode = self._get_processing_mode(selected_mode)
-            print(f"DEBUG: Using processing mode: {mode}")
+            _debug(f"DEBUG: Using processing mode: {mode}")
 
             self._update_progress(progress_label, "🔍 Processing image...")
 
             if mode == "full_image":
-                print("DEBUG: Calculating full-image context extraction...")
-                context_info = self._calculate_full_image_context_extraction(image)
+                _debug("DEBUG: Calculating full-image context extraction...")
+                context_info = self._calculate_full_image_context_extraction(
+                    image, image_state
+                )
             elif mode == "contextual":
-                print("DEBUG: Calculating contextual selection-based extraction...")
-                context_info = self._calculate_context_extraction(image)
+                _debug("DEBUG: Calculating contextual selection-based extraction...")
+                context_info = self._calculate_context_extraction(image, image_state)
             else:
-                print("DEBUG: Unknown mode, defaulting to contextual extraction...")
-                context_info = self._calculate_context_extraction(image)
+                _debug("DEBUG: Unknown mode, defaulting to contextual extraction...")
+                context_info = self._calculate_context_extraction(image, image_state)
 
             self._update_progress(progress_label, "🔍 Analyzing image context...")
 
@@ -1332,29 +1568,29 @@ class InpaintMixin:
                 and context_info
                 and context_info.get("has_selection", False)
             ):
-                print("DEBUG: Sampling boundary colors for color matching...")
+                _debug("DEBUG: Sampling boundary colors for color matching...")
                 color_info = self._sample_boundary_colors(image, context_info)
 
             # Extract context region with padding (works for both modes)
-            print("DEBUG: Extracting context region...")
+            _debug("DEBUG: Extracting context region...")
             success, message, image_data = self._extract_context_region(
-                image, context_info
+                image, context_info, encode_async=True
             )
             if not success:
                 self._update_progress(
                     progress_label, f"❌ Context extraction failed: {message}"
                 )
                 Gimp.message(f"❌ Context Extraction Failed: {message}")
-                print(f"DEBUG: Context extraction failed: {message}")
+                _debug(f"DEBUG: Context extraction failed: {message}")
                 return procedure.new_return_values(
                     Gimp.PDBStatusType.CANCEL, GLib.Error()
                 )
-            print(f"DEBUG: Context extraction succeeded: {message}")
+            _debug(f"DEBUG: Context extraction succeeded: {message}")
 
             self._update_progress(progress_label, "🎭 Creating selection mask...")
 
             # Create smart mask that respects selection within context
-            print("DEBUG: Creating context-aware mask...")
+            _debug("DEBUG: Creating context-aware mask...")
             if not context_info:
                 self._update_progress(progress_label, "❌ Context info not available")
                 Gimp.message("❌ Context info not available")
@@ -1366,6 +1602,11 @@ class InpaintMixin:
                 image, context_info, context_info["target_size"]
             )
 
+            # Resolve the background context-image encode (queued alongside the
+            # export above) now that mask creation has finished.
+            if isinstance(image_data, Future):
+                image_data = image_data.result()
+
             self._update_progress(progress_label, "🚀 Starting AI processing...")
 
             # Route based on mode:
@@ -1384,16 +1625,20 @@ class InpaintMixin:
                 wf = (self.config.get("workflows", {}) or {}).get("inpaint_focused", {}) or {}
                 overrides = (wf.get("overrides") or {}) if isinstance(wf, dict) else {}
                 if isinstance(overrides, dict) and ("inputMaskFilename" not in overrides):
+                    # Warm the server connection and workflow-template cache on
+                    # the export pool while the alpha embed (PDB-bound, so
+                    # main-thread only) runs; the warmup swallows all errors
+                    _EXPORT_POOL.submit(self._comfyui_warmup, action)
                     try:
-                        img_bytes = base64.b64decode(image_data)
+                        # image_data is already raw PNG bytes end-to-end
                         embedded = self._comfyui_embed_mask_into_image_alpha(
-                            img_bytes, mask_data, strength_percent=mask_strength
+                            image_data, mask_data, strength_percent=mask_strength
                         )
                         image_data = embedded  # pass bytes through to ComfyUI runner
                         mask_data = None
-                        print("DEBUG: Using embedded alpha mask image for ComfyUI inpaint (single input)")
+                        _debug("DEBUG: Using embedded alpha mask image for ComfyUI inpaint (single input)")
                     except Exception as e:
-                        print(f"DEBUG: Failed to embed mask into alpha (fallback to separate mask): {e}")
+                        _debug(f"DEBUG: Failed to embed mask into alpha (fallback to separate mask): {e}")
 
             # Determine the optimal size for ComfyUI
             if context_info and "target_shape" in context_info:
@@ -1406,7 +1651,7 @@ class InpaintMixin:
             else:
                 api_size = "1024x1024"  # Default
 
-            print(f"DEBUG: Using ComfyUI size: {api_size}, action: {action}")
+            _debug(f"DEBUG: Using ComfyUI size: {api_size}, action: {action}")
 
             api_success, api_message, api_response = self._ai_edit_threaded(
                 image_data,
@@ -1419,7 +1664,7 @@ class InpaintMixin:
             )
 
             if api_success:
-                print(f"DEBUG: AI API succeeded: {api_message}")
+                _debug(f"DEBUG: AI API succeeded: {api_message}")
                 self._update_progress(progress_label, "Processing AI response...")
 
                 # Download and composite result with proper masking
@@ -1430,7 +1675,7 @@ class InpaintMixin:
 
                 if import_success:
                     self._update_progress(progress_label, "✅ AI Inpaint Complete!")
-                    print(f"DEBUG: AI Inpaint Complete - {import_message}")
+                    _debug(f"DEBUG: AI Inpaint Complete - {import_message}")
                 else:
                     self._update_progress(
                         progress_label, f"⚠️ Import Failed: {import_message}"
@@ -1438,7 +1683,7 @@ class InpaintMixin:
                     Gimp.message(
                         f"⚠️ AI Generated but Import Failed!\n\nPrompt: {prompt}\nAPI: {api_message}\nImport Error: {import_message}"
                     )
-                    print(f"DEBUG: Import failed: {import_message}")
+                    _debug(f"DEBUG: Import failed: {import_message}")
             else:
                 # Check if this was a cancellation vs actual API failure
                 if "cancelled" in api_message.lower():
@@ -1451,7 +1696,7 @@ class InpaintMixin:
                         progress_label, f"❌ AI API Failed: {api_message}"
                     )
                     Gimp.message(f"❌ AI API Failed: {api_message}")
-                print(f"DEBUG: AI API failed: {api_message}")
+                _debug(f"DEBUG: AI API failed: {api_message}")
 
             return procedure.new_return_values(Gimp.PDBStatusType.SUCCESS, GLib.Error())
 
@@ -1459,8 +1704,10 @@ class InpaintMixin:
             # Always destroy the dialog
             if dialog:
                 dialog.destroy()
-            # Always restore original layer selection after any operation outcome
-            if original_selected_layers:
+            # Restore the original layer selection after any operation outcome,
+            # but skip the call when nothing changed it (e.g. early cancel) —
+            # restoring is not free, it touches undo state and the canvas
+            if original_selected_layers and image.get_selected_layers() != original_selected_layers:
                 image.set_selected_layers(original_selected_layers)
-                print("DEBUG: Restored layer selection after inpaint operation")
+                _debug("DEBUG: Restored layer selection after inpaint operation")
 
